@@ -290,7 +290,11 @@ class TenantService:
         role: UserRole,
         added_by_user_id: UUID,
         staff_title: Optional[str] = None,
-        specializations: Optional[List[str]] = None
+        specializations: Optional[List[str]] = None,
+        bio: Optional[str] = None,
+        working_hours: Optional[Dict[str, Any]] = None,
+        is_accepting_bookings: bool = True,
+        notification_preferences: Optional[Dict[str, bool]] = None
     ) -> TenantUser:
         """Add a user to a tenant with specific role"""
         
@@ -318,6 +322,10 @@ class TenantService:
                 # Reactivate existing association
                 existing_association.is_active = True
                 existing_association.role = role
+                existing_association.bio = bio
+                existing_association.working_hours = working_hours
+                existing_association.is_accepting_bookings = is_accepting_bookings
+                existing_association.notification_preferences = notification_preferences
                 self.db.commit()
                 return existing_association
         
@@ -328,6 +336,10 @@ class TenantService:
             role=role,
             staff_title=staff_title,
             specializations=specializations,
+            bio=bio,
+            working_hours=working_hours,
+            is_accepting_bookings=is_accepting_bookings,
+            notification_preferences=notification_preferences,
             is_active=True
         )
         
@@ -0,0 +1,72 @@
+"""
+Redis cache helpers for BookingBot NG
+Shared Redis client and tenant-scoped cache keys invalidated by a version counter
+"""
+
+import os
+import json
+import hashlib
+from typing import Any, Optional
+
+import redis
+from loguru import logger
+
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Get the shared Redis client"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(REDIS_URL)
+    return _redis_client
+
+
+def _version_key(namespace: str, tenant_id: Any) -> str:
+    return f"{namespace}ver:{tenant_id}"
+
+
+def tenant_cache_key(client: redis.Redis, namespace: str, tenant_id: Any, *params: Any) -> Optional[str]:
+    """
+    Build a cache key for a tenant-scoped entry.
+    
+    The key embeds the tenant's current namespace version, so bumping the
+    version orphans every older entry at once. Returns None if Redis is
+    unavailable, in which case callers should skip the cache.
+    """
+    try:
+        version = client.get(_version_key(namespace, tenant_id))
+    except redis.RedisError as e:
+        logger.warning(f"Cache version lookup failed for {namespace}:{tenant_id}: {e}")
+        return None
+    
+    params_hash = hashlib.sha1(json.dumps(params, default=str).encode()).hexdigest()
+    return f"{namespace}:{tenant_id}:{int(version or 0)}:{params_hash}"
+
+
+def bump_tenant_cache_version(client: redis.Redis, namespace: str, tenant_id: Any) -> None:
+    """Invalidate every cached entry for a tenant in a namespace"""
+    try:
+        client.incr(_version_key(namespace, tenant_id))
+    except redis.RedisError as e:
+        logger.warning(f"Cache invalidation failed for {namespace}:{tenant_id}: {e}")
+
+
+def cache_get(client: redis.Redis, key: str) -> Optional[bytes]:
+    """Get a cached value, treating Redis errors as a miss"""
+    try:
+        return client.get(key)
+    except redis.RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+
+
+def cache_set(client: redis.Redis, key: str, value: bytes, ttl_seconds: int) -> None:
+    """Store a value with an expiry, ignoring Redis errors"""
+    try:
+        client.setex(key, ttl_seconds, value)
+    except redis.RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
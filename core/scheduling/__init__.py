@@ -13,6 +13,7 @@ from .models import (
     CalendarIntegration,
     AppointmentReminder,
     BookingAnalytics,
+    StaffDailyMetrics,
     StaffSchedule,
     AppointmentStatus,
     RecurrenceType,
@@ -96,6 +97,7 @@ __all__ = [
     "CalendarIntegration",
     "AppointmentReminder",
     "BookingAnalytics",
+    "StaffDailyMetrics",
     "StaffSchedule",
     "AppointmentStatus",
     "RecurrenceType",
@@ -8,7 +8,7 @@ from typing import Optional, Dict, Any, List
 from enum import Enum
 from decimal import Decimal
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, DECIMAL, Date, Time
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, DECIMAL, Date, Time, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Mapped
 from sqlalchemy.dialects.postgresql import UUID
@@ -140,6 +140,14 @@ class ServiceDefinition(Base):
 class Appointment(Base):
     """Core appointment/booking model"""
     __tablename__ = "appointments"
+    __table_args__ = (
+        # Covers per-service analytics aggregates without touching the heap
+        Index(
+            "ix_appointments_service_start_status",
+            "service_id", "start_time", "status",
+            postgresql_include=["payment_amount"]
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
@@ -212,9 +220,13 @@ class Appointment(Base):
     assigned_staff: Mapped[Optional["TenantUser"]] = relationship("TenantUser")
     child_appointments: Mapped[List["Appointment"]] = relationship(
         "Appointment", 
-        backref="parent_appointment",
+        back_populates="parent_appointment",
         remote_side=[id]
     )
+    parent_appointment: Mapped[List["Appointment"]] = relationship(
+        "Appointment",
+        back_populates="child_appointments"
+    )
     
     def __repr__(self):
         return f"<Appointment(reference='{self.booking_reference}', status='{self.status}')>"
@@ -384,6 +396,32 @@ class BookingAnalytics(Base):
         return f"<BookingAnalytics(tenant='{self.tenant_id}', date='{self.date}', bookings={self.total_bookings})>"
 
 
+class StaffDailyMetrics(Base):
+    """Per-staff daily appointment rollup, filled by SchedulingService.rollup_staff_daily_metrics"""
+    __tablename__ = "staff_daily_metrics"
+
+    staff_id = Column(UUID(as_uuid=True), ForeignKey("tenant_users.id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+    
+    # Appointment counts by outcome
+    total_appointments = Column(Integer, nullable=False, default=0)
+    completed_appointments = Column(Integer, nullable=False, default=0)
+    cancelled_appointments = Column(Integer, nullable=False, default=0)
+    no_show_appointments = Column(Integer, nullable=False, default=0)
+    
+    # Completed appointments only; sums rather than averages so days can be added up
+    total_revenue = Column(DECIMAL(12, 2), nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_count = Column(Integer, nullable=False, default=0)
+    
+    # Timestamps
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<StaffDailyMetrics(staff='{self.staff_id}', date='{self.date}', appointments={self.total_appointments})>"
+
+
 class StaffSchedule(Base):
     """Staff working schedules and availability"""
     __tablename__ = "staff_schedules"
@@ -8,12 +8,12 @@ from datetime import datetime, date, time, timedelta
 from typing import Optional, List, Dict, Any, Tuple
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, not_, func
+from sqlalchemy import and_, or_, not_, func, select, literal, insert, delete
 from loguru import logger
 
 from .models import (
     Appointment, ServiceDefinition, BusinessHours, AvailabilitySlot,
-    StaffSchedule, AppointmentStatus, RecurrenceType
+    StaffSchedule, StaffDailyMetrics, AppointmentStatus, RecurrenceType
 )
 from .utils import (
     convert_to_local_time, convert_to_utc, get_nigerian_holidays,
@@ -219,10 +219,12 @@ class SchedulingService:
         
         # Update appointment
         old_start_time = appointment.start_time
+        self._invalidate_staff_daily_metrics(appointment)
         appointment.start_time = new_start_time
         appointment.end_time = new_end_time
         appointment.status = AppointmentStatus.RESCHEDULED
         appointment.updated_at = datetime.utcnow()
+        self._invalidate_staff_daily_metrics(appointment)
         
         # Log the reschedule
         logger.info(
@@ -262,6 +264,7 @@ class SchedulingService:
         appointment.cancellation_reason = cancellation_reason
         appointment.cancelled_by_user_id = cancelled_by_user_id
         appointment.updated_at = datetime.utcnow()
+        self._invalidate_staff_daily_metrics(appointment)
         
         logger.info(f"Cancelled appointment {appointment.booking_reference}")
         
@@ -335,6 +338,7 @@ class SchedulingService:
         appointment.service_completed_at = datetime.utcnow()
         appointment.internal_notes = internal_notes
         appointment.updated_at = datetime.utcnow()
+        self._invalidate_staff_daily_metrics(appointment)
         
         self.db.commit()
         self.db.refresh(appointment)
@@ -353,6 +357,7 @@ class SchedulingService:
         
         appointment.status = AppointmentStatus.NO_SHOW
         appointment.updated_at = datetime.utcnow()
+        self._invalidate_staff_daily_metrics(appointment)
         
         self.db.commit()
         self.db.refresh(appointment)
@@ -445,6 +450,74 @@ class SchedulingService:
             "average_booking_value": float(total_revenue / completed) if completed > 0 else 0
         }
     
+    def rollup_staff_daily_metrics(self, day: date) -> None:
+        """
+        Aggregate one day's appointments into staff_daily_metrics for every staff member.
+        
+        Meant to run nightly for the previous day; rerunning a day replaces its rows,
+        so it is also safe for backfills. Staff-days without a row are read live.
+        """
+        
+        day_start = datetime.combine(day, time.min)
+        completed = Appointment.status == AppointmentStatus.COMPLETED
+        rated = and_(completed, Appointment.customer_rating > 0)
+        
+        daily = select(
+            Appointment.assigned_staff_id,
+            literal(day),
+            Appointment.tenant_id,
+            func.count(),
+            func.count().filter(completed),
+            func.count().filter(Appointment.status == AppointmentStatus.CANCELLED),
+            func.count().filter(Appointment.status == AppointmentStatus.NO_SHOW),
+            func.coalesce(func.sum(Appointment.payment_amount).filter(completed), 0),
+            func.coalesce(func.sum(Appointment.customer_rating).filter(rated), 0),
+            func.count().filter(rated)
+        ).where(
+            Appointment.assigned_staff_id.isnot(None),
+            Appointment.start_time >= day_start,
+            Appointment.start_time < day_start + timedelta(days=1)
+        ).group_by(Appointment.assigned_staff_id, Appointment.tenant_id)
+        
+        # Replace the whole day so staff whose appointments moved away drop out too
+        self.db.execute(delete(StaffDailyMetrics).where(StaffDailyMetrics.date == day))
+        self.db.execute(
+            insert(StaffDailyMetrics).from_select(
+                [
+                    "staff_id", "date", "tenant_id",
+                    "total_appointments", "completed_appointments", "cancelled_appointments",
+                    "no_show_appointments", "total_revenue", "rating_sum", "rating_count"
+                ],
+                daily
+            )
+        )
+        self.db.commit()
+        
+        logger.info(f"Rolled up staff daily metrics for {day}")
+    
+    def backfill_staff_daily_metrics(self, start_day: date, end_day: date) -> None:
+        """Roll up every day from start_day to end_day inclusive, one transaction per day"""
+        
+        day = start_day
+        while day <= end_day:
+            self.rollup_staff_daily_metrics(day)
+            day += timedelta(days=1)
+    
+    def _invalidate_staff_daily_metrics(self, appointment: Appointment) -> None:
+        """Drop the rollup row for the appointment's staff-day so reads fall back to live data"""
+        
+        if not appointment.assigned_staff_id or not appointment.start_time:
+            return
+        
+        self.db.execute(
+            delete(StaffDailyMetrics).where(
+                and_(
+                    StaffDailyMetrics.staff_id == appointment.assigned_staff_id,
+                    StaffDailyMetrics.date == appointment.start_time.date()
+                )
+            )
+        )
+    
     def _is_valid_booking_day(
         self,
         booking_date: date,
@@ -5,14 +5,19 @@ Timezone handling, Nigerian holidays, and date/time helpers
 
 import pytz
 import holidays
-from datetime import datetime, date, time, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, date, time, timedelta, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 from decimal import Decimal
 
 # Nigerian timezone
 NIGERIAN_TIMEZONE = pytz.timezone('Africa/Lagos')
 UTC_TIMEZONE = pytz.UTC
 
+# Africa/Lagos has been a fixed UTC+1 with no DST since 1919, so conversions skip pytz
+_LAGOS_FIXED_OFFSET = timezone(timedelta(hours=1), "WAT")
+
 
 def convert_to_local_time(utc_datetime: datetime, timezone_str: str = "Africa/Lagos") -> datetime:
     """Convert UTC datetime to local timezone"""
@@ -20,6 +25,9 @@ def convert_to_local_time(utc_datetime: datetime, timezone_str: str = "Africa/La
     if utc_datetime.tzinfo is None:
         utc_datetime = UTC_TIMEZONE.localize(utc_datetime)
     
+    if timezone_str == "Africa/Lagos":
+        return utc_datetime.astimezone(_LAGOS_FIXED_OFFSET)
+    
     local_tz = pytz.timezone(timezone_str)
     return utc_datetime.astimezone(local_tz)
 
@@ -28,14 +36,18 @@ def convert_to_utc(local_datetime: datetime, timezone_str: str = "Africa/Lagos")
     """Convert local datetime to UTC"""
     
     if local_datetime.tzinfo is None:
-        local_tz = pytz.timezone(timezone_str)
-        local_datetime = local_tz.localize(local_datetime)
+        if timezone_str == "Africa/Lagos":
+            local_datetime = local_datetime.replace(tzinfo=_LAGOS_FIXED_OFFSET)
+        else:
+            local_tz = pytz.timezone(timezone_str)
+            local_datetime = local_tz.localize(local_datetime)
     
     return local_datetime.astimezone(UTC_TIMEZONE)
 
 
-def get_nigerian_holidays(year: int) -> Dict[date, str]:
-    """Get Nigerian public holidays for a given year"""
+@lru_cache(maxsize=16)
+def get_nigerian_holidays(year: int) -> Mapping[date, str]:
+    """Get Nigerian public holidays for a given year (memoized; the mapping is read-only)"""
     
     # Base holidays
     ng_holidays = holidays.Nigeria(years=year)
@@ -54,7 +66,7 @@ def get_nigerian_holidays(year: int) -> Dict[date, str]:
     all_holidays = dict(ng_holidays)
     all_holidays.update(additional_holidays)
     
-    return all_holidays
+    return MappingProxyType(all_holidays)
 
 
 def is_business_day(check_date: date, exclude_weekends: bool = True) -> bool:
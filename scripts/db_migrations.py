@@ -0,0 +1,71 @@
+"""
+Database migrations for BookingBot NG
+One-off data fixes to run before the matching schema changes are applied
+
+Usage: python scripts/db_migrations.py <migration> [<migration> ...]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.orm import Session
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.database import get_db
+from tenants.models import ServiceSchedule, ServiceCustomField
+
+
+def remove_duplicate_service_rows(db: Session) -> None:
+    """
+    Delete duplicate schedules and custom fields, keeping the most recently updated row per key.
+
+    Run once before creating the uq_service_schedules_service_day and
+    uq_service_custom_fields_service_field constraints on an existing database.
+    """
+    for model, key_columns in (
+        (ServiceSchedule, [ServiceSchedule.service_config_id, ServiceSchedule.day_of_week]),
+        (ServiceCustomField, [ServiceCustomField.service_config_id, ServiceCustomField.field_name])
+    ):
+        ranked = select(
+            model.id,
+            func.row_number().over(
+                partition_by=key_columns,
+                order_by=[model.updated_at.desc(), model.id.desc()]
+            ).label("rank")
+        ).subquery()
+        result = db.execute(
+            delete(model).where(model.id.in_(select(ranked.c.id).where(ranked.c.rank > 1)))
+        )
+        logger.info(f"Removed {result.rowcount} duplicate rows from {model.__tablename__}")
+
+
+MIGRATIONS = {
+    "remove_duplicate_service_rows": remove_duplicate_service_rows
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("migrations", nargs="+", choices=sorted(MIGRATIONS))
+    args = parser.parse_args()
+
+    sessions = get_db()
+    db = next(sessions)
+    try:
+        for name in args.migrations:
+            MIGRATIONS[name](db)
+            db.commit()
+            logger.info(f"Applied migration {name}")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        sessions.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ from .service_config import (
     HealthcareServiceConfig,
     AutomotiveServiceConfig,
     BeautyServiceConfig,
+    GeneralServiceConfig,
     
     # SQLAlchemy Models
     TenantServiceConfig,
@@ -101,6 +102,7 @@ __all__ = [
     "HealthcareServiceConfig",
     "AutomotiveServiceConfig",
     "BeautyServiceConfig",
+    "GeneralServiceConfig",
     "TenantServiceConfig",
     "ServiceSchedule",
     "ServiceCustomField",
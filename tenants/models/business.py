@@ -4,11 +4,13 @@ Handles detailed business information, settings, and operational configurations
 """
 
 from datetime import datetime, time, date
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Mapping
 from enum import Enum
 from decimal import Decimal
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, DECIMAL, Date, Time
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, DECIMAL, Date, Time, Index, text, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Mapped
 from sqlalchemy.dialects.postgresql import UUID
@@ -319,6 +321,9 @@ class BusinessProfile(Base):
     max_staff = Column(Integer, default=5)
     max_daily_bookings = Column(Integer, default=50)
     max_services = Column(Integer, default=10)
+    # Active staff and admins, maintained by the staff routes for the max_staff check;
+    # NULL until the staff routes seed it from the membership count
+    active_staff_count = Column(Integer, nullable=True)
     
     # Performance metrics
     total_bookings = Column(Integer, default=0)
@@ -341,7 +346,12 @@ class BusinessProfile(Base):
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Stamped by the database in UTC so every web host agrees on the clock; stays naive like created_at
+    updated_at = Column(
+        DateTime,
+        server_default=func.timezone("utc", func.now()),
+        onupdate=func.timezone("utc", func.now())
+    )
     
     # Relationships
     business_documents: Mapped[List["BusinessDocument"]] = relationship("BusinessDocument", back_populates="business_profile")
@@ -403,6 +413,10 @@ class BusinessProfile(Base):
 class BusinessDocument(Base):
     """Business verification and legal documents"""
     __tablename__ = "business_documents"
+    __table_args__ = (
+        # Serves the per-profile document listing in upload order
+        Index("ix_business_documents_profile_uploaded", "business_profile_id", text("uploaded_at DESC")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     business_profile_id = Column(UUID(as_uuid=True), ForeignKey("business_profiles.id"), nullable=False)
@@ -600,8 +614,9 @@ class NigerianBusinessCompliance(Base):
         return score
 
 
-def get_nigerian_business_requirements(business_type: str) -> Dict[str, Any]:
-    """Get compliance requirements for Nigerian business types"""
+@lru_cache(maxsize=None)
+def get_nigerian_business_requirements(business_type: str) -> Mapping[str, Any]:
+    """Get compliance requirements for Nigerian business types (cached, read-only)"""
     
     base_requirements = {
         "cac_certificate": {"required": True, "description": "Certificate of Incorporation"},
@@ -634,4 +649,8 @@ def get_nigerian_business_requirements(business_type: str) -> Dict[str, Any]:
     if business_type in industry_requirements:
         requirements.update(industry_requirements[business_type])
     
-    return requirements
\ No newline at end of file
+    # The result is shared between callers, so freeze each requirement as well
+    return MappingProxyType({
+        name: MappingProxyType(requirement)
+        for name, requirement in requirements.items()
+    })
\ No newline at end of file
@@ -3,16 +3,16 @@ Service configuration models for BookingBot NG tenants
 Handles dynamic service definitions and custom field configurations for different business types
 """
 
-from datetime import datetime, time
-from typing import Optional, List, Dict, Any, Union
+from datetime import time
+from typing import Optional, List, Dict, Any, Union, Literal
 from enum import Enum
 from decimal import Decimal
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, DECIMAL, Time
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, DECIMAL, Time, Index, UniqueConstraint, text, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Mapped
-from sqlalchemy.dialects.postgresql import UUID
-from pydantic import BaseModel, Field, validator
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from pydantic import BaseModel, Field, validator, root_validator
 import uuid
 
 Base = declarative_base()
@@ -142,9 +142,9 @@ class ServicePricingSchema(BaseModel):
     
     @validator('deposit_percentage')
     def validate_deposit(cls, v, values):
-        if values.get('partial_payment_allowed') and not v:
-            raise ValueError("Deposit percentage required when partial payment is allowed")
-        return v
+        if v or not values.get('partial_payment_allowed'):
+            return v
+        raise ValueError("Deposit percentage required when partial payment is allowed")
 
 
 class ServiceAvailabilitySchema(BaseModel):
@@ -186,6 +186,108 @@ class ServiceAvailabilitySchema(BaseModel):
         return sorted(list(set(v)))
 
 
+# Industry-specific configuration schemas
+
+class HealthcareServiceConfig(BaseModel):
+    """Healthcare-specific service configuration"""
+    
+    kind: Literal["healthcare"] = "healthcare"
+    consultation_type: str = Field(..., description="General, Specialist, Emergency, etc.")
+    requires_medical_history: bool = True
+    requires_insurance_info: bool = False
+    accepts_nhis: bool = True
+    
+    # Medical requirements
+    requires_referral: bool = False
+    age_restrictions: Optional[Dict[str, int]] = None  # min_age, max_age
+    gender_restrictions: Optional[str] = None  # male, female, none
+    
+    # Documentation
+    required_documents: Optional[List[str]] = None
+    medical_clearance_required: bool = False
+    
+    # Safety protocols
+    covid_protocols: Optional[Dict[str, Any]] = None
+    isolation_required: bool = False
+    
+    # Keep keys this schema does not know about, as the untyped dict did
+    class Config:
+        extra = "allow"
+
+
+class AutomotiveServiceConfig(BaseModel):
+    """Automotive service configuration"""
+    
+    kind: Literal["automotive"] = "automotive"
+    service_type: Optional[str] = Field(None, description="Maintenance, Repair, Inspection, etc.")
+    vehicle_inspection_required: bool = True
+    parts_included: bool = False
+    
+    # Vehicle requirements
+    supported_vehicle_types: List[str] = ["Car", "SUV", "Truck", "Motorcycle"]
+    supported_makes: Optional[List[str]] = None
+    year_restrictions: Optional[Dict[str, int]] = None
+    
+    # Service specifics
+    requires_vehicle_history: bool = False
+    warranty_provided: bool = False
+    warranty_duration_days: Optional[int] = None
+    
+    # Documentation
+    requires_registration_papers: bool = False
+    requires_insurance_proof: bool = False
+    
+    # Keep keys this schema does not know about, as the untyped dict did
+    class Config:
+        extra = "allow"
+
+
+class BeautyServiceConfig(BaseModel):
+    """Beauty and wellness service configuration"""
+    
+    kind: Literal["beauty"] = "beauty"
+    treatment_type: str = Field(..., description="Hair, Skin, Nails, Massage, etc.")
+    duration_category: str = Field(..., description="Express, Standard, Premium")
+    
+    # Treatment specifics
+    gender_preference: Optional[str] = None  # male, female, unisex
+    age_restrictions: Optional[Dict[str, int]] = None
+    
+    # Requirements
+    skin_test_required: bool = False
+    consultation_required: bool = False
+    before_after_photos: bool = False
+    
+    # Products and equipment
+    products_included: bool = True
+    custom_products_allowed: bool = False
+    equipment_required: Optional[List[str]] = None
+    
+    # Keep keys this schema does not know about, as the untyped dict did
+    class Config:
+        extra = "allow"
+
+
+class GeneralServiceConfig(BaseModel):
+    """Free-form configuration for categories without a dedicated schema"""
+    
+    kind: Literal[
+        "financial", "education", "religious", "agriculture",
+        "consulting", "legal", "technology"
+    ]
+    
+    class Config:
+        extra = "allow"
+
+
+IndustryServiceConfig = Union[
+    HealthcareServiceConfig,
+    AutomotiveServiceConfig,
+    BeautyServiceConfig,
+    GeneralServiceConfig
+]
+
+
 class ServiceConfigurationSchema(BaseModel):
     """Complete service configuration schema"""
     
@@ -223,27 +325,27 @@ class ServiceConfigurationSchema(BaseModel):
     tags: Optional[List[str]] = None
     meta_description: Optional[str] = Field(None, max_length=160)
     
-    # Industry-specific configurations
-    industry_config: Optional[Dict[str, Any]] = None
-    
-    @validator('industry_config')
-    def validate_industry_config(cls, v, values):
+    # Industry-specific configurations, dispatched on `kind`
+    industry_config: Optional[IndustryServiceConfig] = Field(None, discriminator="kind")
+    
+    @root_validator(pre=True)
+    def inject_industry_kind(cls, values):
+        # Configs stored before `kind` existed are tagged from the service category
+        industry_config = values.get('industry_config')
+        if isinstance(industry_config, dict) and 'kind' not in industry_config:
+            category = values.get('category')
+            values['industry_config'] = {**industry_config, 'kind': getattr(category, 'value', category)}
+        return values
+    
+    @root_validator(skip_on_failure=True)
+    def check_industry_kind(cls, values):
+        industry_config = values.get('industry_config')
         category = values.get('category')
-        if category and v:
-            # Validate based on category
-            if category == ServiceCategory.HEALTHCARE:
-                required_fields = ['requires_medical_history', 'consultation_type']
-            elif category == ServiceCategory.AUTOMOTIVE:
-                required_fields = ['vehicle_inspection_required', 'parts_included']
-            elif category == ServiceCategory.BEAUTY:
-                required_fields = ['treatment_type', 'duration_category']
-            else:
-                required_fields = []
-            
-            for field in required_fields:
-                if field not in v:
-                    raise ValueError(f"Industry config missing required field: {field}")
-        return v
+        if industry_config is not None and industry_config.kind != category.value:
+            raise ValueError(
+                f"industry_config kind '{industry_config.kind}' does not match category '{category.value}'"
+            )
+        return values
 
 
 # SQLAlchemy ORM Models
@@ -251,6 +353,43 @@ class ServiceConfigurationSchema(BaseModel):
 class TenantServiceConfig(Base):
     """Database model for tenant service configurations"""
     __tablename__ = "tenant_service_configs"
+    __table_args__ = (
+        Index("ix_tenant_service_configs_tenant_category", "tenant_id", "category"),
+        # Matches the list_services ORDER BY so pages come off the index unsorted
+        Index(
+            "ix_tenant_service_configs_listing",
+            "tenant_id", text("is_featured DESC"), "display_order", "name", "id"
+        ),
+        # Partial indexes for the public booking pages, which only ever see bookable services
+        Index(
+            "ix_tenant_service_configs_public_listing",
+            "tenant_id", text("is_featured DESC"), "display_order", "name",
+            postgresql_where=text("is_active AND is_online_bookable")
+        ),
+        Index(
+            "ix_tenant_service_configs_public_category",
+            "tenant_id", "category",
+            postgresql_where=text("is_active AND is_online_bookable")
+        ),
+        Index(
+            "ix_tenant_service_configs_tags",
+            text("(configuration -> 'tags') jsonb_path_ops"),
+            postgresql_using="gin"
+        ),
+        # Trigram indexes (pg_trgm) serve the unanchored ILIKE search in list_services
+        Index(
+            "ix_tenant_service_configs_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_tenant_service_configs_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"}
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
@@ -261,8 +400,14 @@ class TenantServiceConfig(Base):
     category = Column(String(50), nullable=False)
     subcategory = Column(String(100), nullable=True)
     
-    # Configuration as JSON
-    configuration = Column(JSON, nullable=False)  # ServiceConfigurationSchema as dict
+    # Configuration as JSONB (parsed by the driver, filterable server-side)
+    configuration = Column(JSONB, nullable=False)  # ServiceConfigurationSchema as dict
+    
+    # Hot configuration fields, denormalized from `configuration` at write time
+    base_price = Column(DECIMAL(10, 2), nullable=True)
+    currency = Column(String(3), nullable=True)
+    duration_minutes = Column(Integer, nullable=True)
+    image_url = Column(String(500), nullable=True)
     
     # Status and visibility
     is_active = Column(Boolean, default=True)
@@ -276,11 +421,14 @@ class TenantServiceConfig(Base):
     average_rating = Column(DECIMAL(3, 2), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.timezone("utc", func.now()), nullable=False)
+    updated_at = Column(DateTime, server_default=func.timezone("utc", func.now()), onupdate=func.timezone("utc", func.now()), nullable=False)
     
     # Relationships
-    service_schedules: Mapped[List["ServiceSchedule"]] = relationship("ServiceSchedule", back_populates="service_config")
+    schedules: Mapped[List["ServiceSchedule"]] = relationship("ServiceSchedule", back_populates="service_config")
+    custom_fields: Mapped[List["ServiceCustomField"]] = relationship(
+        "ServiceCustomField", back_populates="service_config", order_by="ServiceCustomField.display_order"
+    )
     
     def __repr__(self):
         return f"<TenantServiceConfig(name='{self.name}', tenant='{self.tenant_id}')>"
@@ -289,26 +437,36 @@ class TenantServiceConfig(Base):
         """Convert ORM model to Pydantic schema"""
         return ServiceConfigurationSchema(**self.configuration)
     
+    def apply_schema(self, schema: ServiceConfigurationSchema) -> None:
+        """Copy a Pydantic schema onto the row, including denormalized columns"""
+        self.name = schema.name
+        self.description = schema.description
+        self.category = schema.category.value
+        self.subcategory = schema.subcategory
+        self.configuration = schema.dict()
+        self.base_price = schema.pricing.base_price
+        self.currency = schema.pricing.currency
+        self.duration_minutes = schema.availability.duration_minutes
+        self.image_url = schema.image_url
+        self.is_active = schema.is_active
+        self.is_online_bookable = schema.is_online_bookable
+        self.is_featured = schema.is_featured
+        self.display_order = schema.display_order
+    
     @classmethod
     def from_schema(cls, tenant_id: str, schema: ServiceConfigurationSchema) -> 'TenantServiceConfig':
         """Create ORM model from Pydantic schema"""
-        return cls(
-            tenant_id=tenant_id,
-            name=schema.name,
-            description=schema.description,
-            category=schema.category.value,
-            subcategory=schema.subcategory,
-            configuration=schema.dict(),
-            is_active=schema.is_active,
-            is_online_bookable=schema.is_online_bookable,
-            is_featured=schema.is_featured,
-            display_order=schema.display_order
-        )
+        service = cls(tenant_id=tenant_id)
+        service.apply_schema(schema)
+        return service
 
 
 class ServiceSchedule(Base):
     """Service-specific scheduling overrides"""
     __tablename__ = "service_schedules"
+    __table_args__ = (
+        UniqueConstraint("service_config_id", "day_of_week", name="uq_service_schedules_service_day"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     service_config_id = Column(UUID(as_uuid=True), ForeignKey("tenant_service_configs.id"), nullable=False)
@@ -336,11 +494,11 @@ class ServiceSchedule(Base):
     priority_booking = Column(Boolean, default=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.timezone("utc", func.now()), nullable=False)
+    updated_at = Column(DateTime, server_default=func.timezone("utc", func.now()), onupdate=func.timezone("utc", func.now()), nullable=False)
     
     # Relationships
-    service_config: Mapped["TenantServiceConfig"] = relationship("TenantServiceConfig", back_populates="service_schedules")
+    service_config: Mapped["TenantServiceConfig"] = relationship("TenantServiceConfig", back_populates="schedules")
     
     def __repr__(self):
         return f"<ServiceSchedule(service='{self.service_config_id}', day={self.day_of_week})>"
@@ -349,6 +507,9 @@ class ServiceSchedule(Base):
 class ServiceCustomField(Base):
     """Custom fields for service booking forms"""
     __tablename__ = "service_custom_fields"
+    __table_args__ = (
+        UniqueConstraint("service_config_id", "field_name", name="uq_service_custom_fields_service_field"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     service_config_id = Column(UUID(as_uuid=True), ForeignKey("tenant_service_configs.id"), nullable=False)
@@ -369,80 +530,16 @@ class ServiceCustomField(Base):
     response_count = Column(Integer, default=0)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.timezone("utc", func.now()), nullable=False)
+    updated_at = Column(DateTime, server_default=func.timezone("utc", func.now()), onupdate=func.timezone("utc", func.now()), nullable=False)
+    
+    # Relationships
+    service_config: Mapped["TenantServiceConfig"] = relationship("TenantServiceConfig", back_populates="custom_fields")
     
     def __repr__(self):
         return f"<ServiceCustomField(name='{self.field_name}', type='{self.field_type}')>"
 
 
-# Industry-specific configuration schemas
-
-class HealthcareServiceConfig(BaseModel):
-    """Healthcare-specific service configuration"""
-    
-    consultation_type: str = Field(..., description="General, Specialist, Emergency, etc.")
-    requires_medical_history: bool = True
-    requires_insurance_info: bool = False
-    accepts_nhis: bool = True
-    
-    # Medical requirements
-    requires_referral: bool = False
-    age_restrictions: Optional[Dict[str, int]] = None  # min_age, max_age
-    gender_restrictions: Optional[str] = None  # male, female, none
-    
-    # Documentation
-    required_documents: Optional[List[str]] = None
-    medical_clearance_required: bool = False
-    
-    # Safety protocols
-    covid_protocols: Optional[Dict[str, Any]] = None
-    isolation_required: bool = False
-
-
-class AutomotiveServiceConfig(BaseModel):
-    """Automotive service configuration"""
-    
-    service_type: str = Field(..., description="Maintenance, Repair, Inspection, etc.")
-    vehicle_inspection_required: bool = True
-    parts_included: bool = False
-    
-    # Vehicle requirements
-    supported_vehicle_types: List[str] = ["Car", "SUV", "Truck", "Motorcycle"]
-    supported_makes: Optional[List[str]] = None
-    year_restrictions: Optional[Dict[str, int]] = None
-    
-    # Service specifics
-    requires_vehicle_history: bool = False
-    warranty_provided: bool = False
-    warranty_duration_days: Optional[int] = None
-    
-    # Documentation
-    requires_registration_papers: bool = False
-    requires_insurance_proof: bool = False
-
-
-class BeautyServiceConfig(BaseModel):
-    """Beauty and wellness service configuration"""
-    
-    treatment_type: str = Field(..., description="Hair, Skin, Nails, Massage, etc.")
-    duration_category: str = Field(..., description="Express, Standard, Premium")
-    
-    # Treatment specifics
-    gender_preference: Optional[str] = None  # male, female, unisex
-    age_restrictions: Optional[Dict[str, int]] = None
-    
-    # Requirements
-    skin_test_required: bool = False
-    consultation_required: bool = False
-    before_after_photos: bool = False
-    
-    # Products and equipment
-    products_included: bool = True
-    custom_products_allowed: bool = False
-    equipment_required: Optional[List[str]] = None
-
-
 # Predefined service templates for Nigerian businesses
 
 def get_healthcare_templates() -> List[Dict[str, Any]]:
@@ -590,15 +687,17 @@ def get_beauty_templates() -> List[Dict[str, Any]]:
     ]
 
 
+# Templates are static, so build them once at import; treat the lists as read-only
+_TEMPLATES_BY_CATEGORY: Dict[ServiceCategory, List[Dict[str, Any]]] = {
+    ServiceCategory.HEALTHCARE: get_healthcare_templates(),
+    ServiceCategory.AUTOMOTIVE: get_automotive_templates(),
+    ServiceCategory.BEAUTY: get_beauty_templates()
+}
+
+
 def get_service_templates_by_category(category: ServiceCategory) -> List[Dict[str, Any]]:
     """Get service templates for a specific category"""
-    templates = {
-        ServiceCategory.HEALTHCARE: get_healthcare_templates(),
-        ServiceCategory.AUTOMOTIVE: get_automotive_templates(),
-        ServiceCategory.BEAUTY: get_beauty_templates()
-    }
-    
-    return templates.get(category, [])
+    return _TEMPLATES_BY_CATEGORY.get(category, [])
 
 
 def get_nigerian_custom_field_templates() -> List[CustomFieldSchema]:
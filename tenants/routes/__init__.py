@@ -50,6 +50,7 @@ ROUTE_SUMMARY = {
                 "GET / - List services",
                 "POST / - Create service",
                 "GET /{service_id} - Get service details", 
+                "GET /{service_id}/configuration - Get service configuration",
                 "PUT /{service_id} - Update service",
                 "DELETE /{service_id} - Delete service",
                 "GET /templates/{category} - Get service templates",
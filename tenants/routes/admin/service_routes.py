@@ -3,14 +3,20 @@ Admin service management routes for BookingBot NG
 Handles CRUD operations for tenant services, pricing, and availability settings
 """
 
-from typing import List, Optional, Dict, Any
+import base64
+import json
+from typing import List, Optional, Dict, Any, Tuple, Final
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, time
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, joinedload, load_only, raiseload
+from sqlalchemy import and_, or_, desc, asc, func, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from loguru import logger
+from pydantic import BaseModel
+from redis import Redis
 
 # Core imports
 from core.auth import (
@@ -19,33 +25,204 @@ from core.auth import (
 )
 from core.scheduling import SchedulingService
 from core.database import get_db
+from core.cache import get_redis, tenant_cache_key, bump_tenant_cache_version, cache_get, cache_set
 
 # Tenant imports
 from tenants.models import (
     TenantServiceConfig, ServiceSchedule, ServiceCustomField,
-    ServiceConfigurationSchema, ServiceCategory,
+    ServiceConfigurationSchema, ServiceCategory, CustomFieldType,
     get_service_templates_by_category, get_nigerian_custom_field_templates
 )
 
-router = APIRouter(prefix="/admin/services", tags=["Admin Services"])
+router = APIRouter(
+    prefix="/admin/services",
+    tags=["Admin Services"],
+    default_response_class=ORJSONResponse
+)
+
+# Service list pages are cached per tenant and invalidated on every write
+SERVICE_LIST_CACHE = "svc"
+SERVICE_LIST_CACHE_TTL = 300
+
+_DAY_NAMES: Final = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+# Response Schemas
+
+class ServiceSummarySchema(BaseModel):
+    """Service as shown in the admin service list"""
+    id: UUID
+    name: str
+    description: Optional[str]
+    category: str
+    subcategory: Optional[str]
+    is_active: bool
+    is_online_bookable: bool
+    is_featured: bool
+    display_order: int
+    total_bookings: int
+    total_revenue: float
+    average_rating: Optional[float]
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        orm_mode = True
+
+
+class ServiceScheduleSchema(BaseModel):
+    """Day-specific schedule override for a service"""
+    id: UUID
+    day_of_week: int
+    is_available: bool
+    start_time: Optional[time]
+    end_time: Optional[time]
+    max_bookings: Optional[int]
+    assigned_staff_id: Optional[UUID]
+    price_override: Optional[float]
+    
+    class Config:
+        orm_mode = True
+
+
+class ServiceCustomFieldSchema(BaseModel):
+    """Custom booking form field attached to a service"""
+    id: UUID
+    field_name: str
+    field_label: str
+    field_type: str
+    field_config: Dict[str, Any]
+    display_order: int
+    is_required: bool
+    is_active: bool
+    
+    class Config:
+        orm_mode = True
+
+
+class ServiceDetailSchema(ServiceSummarySchema):
+    """Service with its configuration, schedules and custom fields"""
+    configuration: Dict[str, Any]
+    schedules: List[ServiceScheduleSchema]
+    custom_fields: List[ServiceCustomFieldSchema]
+
+
+class ServiceListSchema(BaseModel):
+    """Page of services with the cursor for the next page"""
+    services: List[ServiceSummarySchema]
+    limit: int
+    next_cursor: Optional[str]
+    has_more: bool
+    total_count: Optional[int]
+
+
+# Pagination Helpers
+
+def _encode_cursor(service: TenantServiceConfig) -> str:
+    """Encode a service's listing sort key as an opaque page cursor"""
+    key = [bool(service.is_featured), service.display_order, service.name, str(service.id)]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[bool, int, str, UUID]:
+    """Decode a page cursor produced by _encode_cursor"""
+    try:
+        is_featured, display_order, name, service_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return bool(is_featured), int(display_order), str(name), UUID(service_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+# Row Builders
+
+def _custom_field_rows(service: TenantServiceConfig, tenant: Tenant) -> List[Dict[str, Any]]:
+    """Build ServiceCustomField insert mappings from the service's serialized configuration"""
+    # apply_schema already dumped the custom fields; reuse those dicts
+    return [
+        {
+            "service_config_id": service.id,
+            "tenant_id": tenant.id,
+            "field_name": field["name"],
+            "field_label": field["label"],
+            "field_type": CustomFieldType(field["field_type"]).value,
+            "field_config": field,
+            "display_order": field["order"],
+            "is_required": field["required"]
+        }
+        for field in service.configuration["custom_fields"]
+    ]
+
+
+def _require_unique(values: List[Any], label: str) -> None:
+    """Reject a payload that repeats a key the upserts and unique constraints rely on"""
+    duplicates = sorted({str(value) for value in values if values.count(value) > 1})
+    if duplicates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Duplicate {label}: {', '.join(duplicates)}"
+        )
+
+
+def _upsert_rows(db: Session, model, rows: List[Dict[str, Any]], key_columns: List[str]) -> None:
+    """Insert rows, updating in place any that collide on key_columns"""
+    stmt = pg_insert(model).values(rows)
+    update_columns = {
+        column: stmt.excluded[column]
+        for column in rows[0] if column not in key_columns
+    }
+    update_columns["updated_at"] = func.timezone("utc", func.now())
+    db.execute(stmt.on_conflict_do_update(index_elements=key_columns, set_=update_columns))
 
 
 # Service CRUD Operations
 
-@router.get("/", response_model=List[Dict[str, Any]])
-async def list_services(
+@router.get("/", response_model=ServiceListSchema)
+def list_services(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
     category: Optional[ServiceCategory] = Query(None, description="Filter by service category"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search by service name"),
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0)
+    after: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    with_total: bool = Query(False, description="Include the total number of matching services")
 ):
     """Get list of services for the tenant"""
     
-    query = db.query(TenantServiceConfig).filter(
+    cache_key = tenant_cache_key(
+        redis_client, SERVICE_LIST_CACHE, tenant.id,
+        category.value if category else None, is_active, search, limit, after, with_total
+    )
+    if cache_key:
+        cached = cache_get(redis_client, cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+    
+    # Only the listed columns; the configuration blob is served per service
+    query = db.query(TenantServiceConfig).options(
+        load_only(
+            TenantServiceConfig.id,
+            TenantServiceConfig.name,
+            TenantServiceConfig.description,
+            TenantServiceConfig.category,
+            TenantServiceConfig.subcategory,
+            TenantServiceConfig.is_active,
+            TenantServiceConfig.is_online_bookable,
+            TenantServiceConfig.is_featured,
+            TenantServiceConfig.display_order,
+            TenantServiceConfig.total_bookings,
+            TenantServiceConfig.total_revenue,
+            TenantServiceConfig.average_rating,
+            TenantServiceConfig.created_at,
+            TenantServiceConfig.updated_at
+        ),
+        raiseload("*")
+    ).filter(
         TenantServiceConfig.tenant_id == tenant.id
     )
     
@@ -57,55 +234,65 @@ async def list_services(
         query = query.filter(TenantServiceConfig.is_active == is_active)
     
     if search:
+        # Served by the pg_trgm GIN indexes on name and description
+        pattern = f"%{search}%"
         query = query.filter(
             or_(
-                TenantServiceConfig.name.ilike(f"%{search}%"),
-                TenantServiceConfig.description.ilike(f"%{search}%")
+                TenantServiceConfig.name.ilike(pattern),
+                TenantServiceConfig.description.ilike(pattern)
             )
         )
     
-    # Get total count for pagination
-    total_count = query.count()
+    # Counting is a second scan, so only do it when asked
+    total_count = query.count() if with_total else None
     
-    # Apply pagination and ordering
+    # Seek past the previous page instead of scanning and discarding offset rows
+    if after:
+        last_featured, last_order, last_name, last_id = _decode_cursor(after)
+        query = query.filter(
+            or_(
+                TenantServiceConfig.is_featured < last_featured,
+                and_(
+                    TenantServiceConfig.is_featured == last_featured,
+                    tuple_(
+                        TenantServiceConfig.display_order,
+                        TenantServiceConfig.name,
+                        TenantServiceConfig.id
+                    ) > tuple_(last_order, last_name, last_id)
+                )
+            )
+        )
+    
+    # Fetch one extra row to learn whether another page exists
     services = query.order_by(
         desc(TenantServiceConfig.is_featured),
         asc(TenantServiceConfig.display_order),
-        asc(TenantServiceConfig.name)
-    ).offset(offset).limit(limit).all()
-    
-    # Format response
-    service_list = []
-    for service in services:
-        service_data = {
-            "id": str(service.id),
-            "name": service.name,
-            "description": service.description,
-            "category": service.category,
-            "subcategory": service.subcategory,
-            "configuration": service.configuration,
-            "is_active": service.is_active,
-            "is_online_bookable": service.is_online_bookable,
-            "is_featured": service.is_featured,
-            "display_order": service.display_order,
-            "total_bookings": service.total_bookings,
-            "total_revenue": float(service.total_revenue),
-            "average_rating": float(service.average_rating) if service.average_rating else None,
-            "created_at": service.created_at.isoformat(),
-            "updated_at": service.updated_at.isoformat()
-        }
-        service_list.append(service_data)
+        asc(TenantServiceConfig.name),
+        asc(TenantServiceConfig.id)
+    ).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(services) > limit:
+        services = services[:limit]
+        next_cursor = _encode_cursor(services[-1])
+    
+    response = ORJSONResponse(
+        ServiceListSchema(
+            services=services,
+            limit=limit,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
+            total_count=total_count
+        ).dict()
+    )
+    if cache_key:
+        cache_set(redis_client, cache_key, response.body, SERVICE_LIST_CACHE_TTL)
     
-    return {
-        "services": service_list,
-        "total_count": total_count,
-        "limit": limit,
-        "offset": offset
-    }
+    return response
 
 
-@router.get("/{service_id}", response_model=Dict[str, Any])
-async def get_service(
+@router.get("/{service_id}", response_model=ServiceDetailSchema)
+def get_service(
     service_id: UUID,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
@@ -113,7 +300,12 @@ async def get_service(
 ):
     """Get a specific service by ID"""
     
-    service = db.query(TenantServiceConfig).filter(
+    # Load schedules and custom fields in the same round trip
+    service = db.query(TenantServiceConfig).options(
+        joinedload(TenantServiceConfig.schedules),
+        joinedload(TenantServiceConfig.custom_fields),
+        raiseload("*")
+    ).filter(
         and_(
             TenantServiceConfig.id == service_id,
             TenantServiceConfig.tenant_id == tenant.id
@@ -126,70 +318,50 @@ async def get_service(
             detail="Service not found"
         )
     
-    # Get service schedules
-    schedules = db.query(ServiceSchedule).filter(
-        ServiceSchedule.service_config_id == service.id
-    ).all()
+    return ServiceDetailSchema.from_orm(service)
+
+
+@router.get("/{service_id}/configuration", response_model=Dict[str, Any])
+def get_service_configuration(
+    service_id: UUID,
+    tenant_user: TenantUser = Depends(require_tenant_admin),
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_db)
+):
+    """Get the full configuration of a service"""
+    
+    configuration = db.query(TenantServiceConfig.configuration).filter(
+        and_(
+            TenantServiceConfig.id == service_id,
+            TenantServiceConfig.tenant_id == tenant.id
+        )
+    ).scalar()
     
-    # Get custom fields
-    custom_fields = db.query(ServiceCustomField).filter(
-        ServiceCustomField.service_config_id == service.id
-    ).order_by(ServiceCustomField.display_order).all()
+    if configuration is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Service not found"
+        )
     
     return {
-        "id": str(service.id),
-        "name": service.name,
-        "description": service.description,
-        "category": service.category,
-        "subcategory": service.subcategory,
-        "configuration": service.configuration,
-        "is_active": service.is_active,
-        "is_online_bookable": service.is_online_bookable,
-        "is_featured": service.is_featured,
-        "display_order": service.display_order,
-        "total_bookings": service.total_bookings,
-        "total_revenue": float(service.total_revenue),
-        "average_rating": float(service.average_rating) if service.average_rating else None,
-        "schedules": [
-            {
-                "id": str(schedule.id),
-                "day_of_week": schedule.day_of_week,
-                "is_available": schedule.is_available,
-                "start_time": schedule.start_time.isoformat() if schedule.start_time else None,
-                "end_time": schedule.end_time.isoformat() if schedule.end_time else None,
-                "max_bookings": schedule.max_bookings,
-                "assigned_staff_id": str(schedule.assigned_staff_id) if schedule.assigned_staff_id else None,
-                "price_override": float(schedule.price_override) if schedule.price_override else None
-            }
-            for schedule in schedules
-        ],
-        "custom_fields": [
-            {
-                "id": str(field.id),
-                "field_name": field.field_name,
-                "field_label": field.field_label,
-                "field_type": field.field_type,
-                "field_config": field.field_config,
-                "display_order": field.display_order,
-                "is_required": field.is_required,
-                "is_active": field.is_active
-            }
-            for field in custom_fields
-        ],
-        "created_at": service.created_at.isoformat(),
-        "updated_at": service.updated_at.isoformat()
+        "service_id": str(service_id),
+        "configuration": configuration
     }
 
 
 @router.post("/", response_model=Dict[str, Any])
-async def create_service(
+def create_service(
     service_config: ServiceConfigurationSchema,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Create a new service"""
     
+    _require_unique([field.name for field in service_config.custom_fields], "custom field names")
+    _require_unique(service_config.availability.available_days_of_week, "days of week")
+    
     # Check if service name already exists for this tenant
     existing_service = db.query(TenantServiceConfig).filter(
         and_(
@@ -211,33 +383,24 @@ async def create_service(
     db.flush()  # Get the service ID
     
     # Create custom fields if provided
-    for field_schema in service_config.custom_fields:
-        custom_field = ServiceCustomField(
-            service_config_id=service.id,
-            tenant_id=tenant.id,
-            field_name=field_schema.name,
-            field_label=field_schema.label,
-            field_type=field_schema.field_type.value,
-            field_config=field_schema.dict(),
-            display_order=field_schema.order,
-            is_required=field_schema.required
-        )
-        db.add(custom_field)
+    db.bulk_insert_mappings(ServiceCustomField, _custom_field_rows(service, tenant))
     
     # Create default schedules based on availability settings
-    for day in service_config.availability.available_days_of_week:
-        schedule = ServiceSchedule(
-            service_config_id=service.id,
-            tenant_id=tenant.id,
-            day_of_week=day,
-            is_available=True
-        )
-        db.add(schedule)
+    db.bulk_insert_mappings(ServiceSchedule, [
+        {
+            "service_config_id": service.id,
+            "tenant_id": tenant.id,
+            "day_of_week": day,
+            "is_available": True
+        }
+        for day in service_config.availability.available_days_of_week
+    ])
     
     db.commit()
+    bump_tenant_cache_version(redis_client, SERVICE_LIST_CACHE, tenant.id)
     db.refresh(service)
     
-    logger.info(f"Created service '{service.name}' for tenant {tenant.business_name}")
+    logger.info("Created service '{}' for tenant {}", service.name, tenant.business_name)
     
     return {
         "id": str(service.id),
@@ -247,16 +410,19 @@ async def create_service(
 
 
 @router.put("/{service_id}", response_model=Dict[str, Any])
-async def update_service(
+def update_service(
     service_id: UUID,
     service_config: ServiceConfigurationSchema,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Update an existing service"""
     
-    service = db.query(TenantServiceConfig).filter(
+    _require_unique([field.name for field in service_config.custom_fields], "custom field names")
+    
+    service = db.query(TenantServiceConfig).options(raiseload("*")).filter(
         and_(
             TenantServiceConfig.id == service_id,
             TenantServiceConfig.tenant_id == tenant.id
@@ -286,39 +452,25 @@ async def update_service(
             )
     
     # Update service
-    service.name = service_config.name
-    service.description = service_config.description
-    service.category = service_config.category.value
-    service.subcategory = service_config.subcategory
-    service.configuration = service_config.dict()
-    service.is_active = service_config.is_active
-    service.is_online_bookable = service_config.is_online_bookable
-    service.is_featured = service_config.is_featured
-    service.display_order = service_config.display_order
-    service.updated_at = datetime.utcnow()
-    
-    # Update custom fields (delete and recreate for simplicity)
+    service.apply_schema(service_config)
+    
+    # Update custom fields: drop removed ones, upsert the rest by field name
+    field_rows = _custom_field_rows(service, tenant)
     db.query(ServiceCustomField).filter(
-        ServiceCustomField.service_config_id == service.id
-    ).delete()
-    
-    for field_schema in service_config.custom_fields:
-        custom_field = ServiceCustomField(
-            service_config_id=service.id,
-            tenant_id=tenant.id,
-            field_name=field_schema.name,
-            field_label=field_schema.label,
-            field_type=field_schema.field_type.value,
-            field_config=field_schema.dict(),
-            display_order=field_schema.order,
-            is_required=field_schema.required
+        and_(
+            ServiceCustomField.service_config_id == service.id,
+            ServiceCustomField.field_name.notin_([row["field_name"] for row in field_rows])
         )
-        db.add(custom_field)
+    ).delete(synchronize_session=False)
+    
+    if field_rows:
+        _upsert_rows(db, ServiceCustomField, field_rows, ["service_config_id", "field_name"])
     
     db.commit()
+    bump_tenant_cache_version(redis_client, SERVICE_LIST_CACHE, tenant.id)
     db.refresh(service)
     
-    logger.info(f"Updated service '{service.name}' for tenant {tenant.business_name}")
+    logger.info("Updated service '{}' for tenant {}", service.name, tenant.business_name)
     
     return {
         "id": str(service.id),
@@ -328,15 +480,16 @@ async def update_service(
 
 
 @router.delete("/{service_id}")
-async def delete_service(
+def delete_service(
     service_id: UUID,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Delete a service (soft delete by deactivating)"""
     
-    service = db.query(TenantServiceConfig).filter(
+    service = db.query(TenantServiceConfig).options(raiseload("*")).filter(
         and_(
             TenantServiceConfig.id == service_id,
             TenantServiceConfig.tenant_id == tenant.id
@@ -351,7 +504,7 @@ async def delete_service(
     
     # Check if service has active bookings
     from core.scheduling import Appointment, AppointmentStatus
-    active_bookings = db.query(Appointment).filter(
+    active_query = db.query(Appointment).filter(
         and_(
             Appointment.service_id == service_id,
             Appointment.status.in_([
@@ -360,9 +513,11 @@ async def delete_service(
                 AppointmentStatus.CHECKED_IN
             ])
         )
-    ).count()
+    )
     
-    if active_bookings > 0:
+    # EXISTS stops at the first match; only count when reporting the conflict
+    if db.query(active_query.exists()).scalar():
+        active_bookings = active_query.count()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Cannot delete service with {active_bookings} active bookings. Please complete or cancel them first."
@@ -371,11 +526,12 @@ async def delete_service(
     # Soft delete by deactivating
     service.is_active = False
     service.is_online_bookable = False
-    service.updated_at = datetime.utcnow()
+    service.updated_at = func.timezone("utc", func.now())
     
     db.commit()
+    bump_tenant_cache_version(redis_client, SERVICE_LIST_CACHE, tenant.id)
     
-    logger.info(f"Deactivated service '{service.name}' for tenant {tenant.business_name}")
+    logger.info("Deactivated service '{}' for tenant {}", service.name, tenant.business_name)
     
     return {"message": "Service deactivated successfully"}
 
@@ -383,7 +539,7 @@ async def delete_service(
 # Service Templates and Wizards
 
 @router.get("/templates/{category}", response_model=List[Dict[str, Any]])
-async def get_service_templates(
+def get_service_templates(
     category: ServiceCategory,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant)
@@ -399,12 +555,13 @@ async def get_service_templates(
 
 
 @router.post("/from-template", response_model=Dict[str, Any])
-async def create_service_from_template(
+def create_service_from_template(
     template_data: Dict[str, Any] = Body(...),
     customizations: Optional[Dict[str, Any]] = Body(None),
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Create a service from a template with customizations"""
     
@@ -416,6 +573,7 @@ async def create_service_from_template(
     # Validate and create service
     try:
         service_config = ServiceConfigurationSchema(**service_data)
+        _require_unique([field.name for field in service_config.custom_fields], "custom field names")
         
         # Create service
         service = TenantServiceConfig.from_schema(str(tenant.id), service_config)
@@ -425,23 +583,13 @@ async def create_service_from_template(
         
         # Create custom fields from template
         if service_config.custom_fields:
-            for field_schema in service_config.custom_fields:
-                custom_field = ServiceCustomField(
-                    service_config_id=service.id,
-                    tenant_id=tenant.id,
-                    field_name=field_schema.name,
-                    field_label=field_schema.label,
-                    field_type=field_schema.field_type.value,
-                    field_config=field_schema.dict(),
-                    display_order=field_schema.order,
-                    is_required=field_schema.required
-                )
-                db.add(custom_field)
+            db.bulk_insert_mappings(ServiceCustomField, _custom_field_rows(service, tenant))
         
         db.commit()
+        bump_tenant_cache_version(redis_client, SERVICE_LIST_CACHE, tenant.id)
         db.refresh(service)
         
-        logger.info(f"Created service '{service.name}' from template for tenant {tenant.business_name}")
+        logger.info("Created service '{}' from template for tenant {}", service.name, tenant.business_name)
         
         return {
             "id": str(service.id),
@@ -449,6 +597,8 @@ async def create_service_from_template(
             "message": "Service created from template successfully"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -459,7 +609,7 @@ async def create_service_from_template(
 # Service Analytics
 
 @router.get("/{service_id}/analytics", response_model=Dict[str, Any])
-async def get_service_analytics(
+def get_service_analytics(
     service_id: UUID,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
@@ -488,23 +638,30 @@ async def get_service_analytics(
     end_date = date.today()
     start_date = end_date - timedelta(days=days)
     
-    # Get appointments for this service
-    from core.scheduling import Appointment
-    appointments = db.query(Appointment).filter(
+    # Aggregate appointments for this service in a single pass
+    from core.scheduling import Appointment, AppointmentStatus
+    completed = Appointment.status == AppointmentStatus.COMPLETED
+    metrics = db.query(
+        func.count().label("total"),
+        func.count().filter(completed).label("completed"),
+        func.count().filter(Appointment.status == AppointmentStatus.CANCELLED).label("cancelled"),
+        func.count().filter(Appointment.status == AppointmentStatus.NO_SHOW).label("no_show"),
+        func.coalesce(func.sum(Appointment.payment_amount).filter(completed), 0).label("revenue")
+    ).filter(
         and_(
             Appointment.service_id == service_id,
             Appointment.start_time >= start_date,
             Appointment.start_time <= end_date
         )
-    ).all()
+    ).one()
     
     # Calculate metrics
-    total_bookings = len(appointments)
-    completed_bookings = len([a for a in appointments if a.status == "completed"])
-    cancelled_bookings = len([a for a in appointments if a.status == "cancelled"])
-    no_show_bookings = len([a for a in appointments if a.status == "no_show"])
+    total_bookings = metrics.total
+    completed_bookings = metrics.completed
+    cancelled_bookings = metrics.cancelled
+    no_show_bookings = metrics.no_show
     
-    total_revenue = sum([float(a.payment_amount or 0) for a in appointments if a.status == "completed"])
+    total_revenue = float(metrics.revenue)
     average_booking_value = total_revenue / completed_bookings if completed_bookings > 0 else 0
     
     return {
@@ -533,55 +690,62 @@ async def get_service_analytics(
 # Bulk Operations
 
 @router.post("/bulk-update", response_model=Dict[str, Any])
-async def bulk_update_services(
+def bulk_update_services(
     service_ids: List[UUID] = Body(...),
     updates: Dict[str, Any] = Body(...),
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Bulk update multiple services"""
     
     # Validate service IDs belong to tenant
-    services = db.query(TenantServiceConfig).filter(
+    owned_count = db.query(func.count(TenantServiceConfig.id)).filter(
         and_(
             TenantServiceConfig.id.in_(service_ids),
             TenantServiceConfig.tenant_id == tenant.id
         )
-    ).all()
+    ).scalar()
     
-    if len(services) != len(service_ids):
+    if owned_count != len(service_ids):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="One or more services not found"
         )
     
-    # Apply updates
-    updated_count = 0
+    # Apply updates in a single statement
     allowed_fields = ['is_active', 'is_online_bookable', 'is_featured', 'display_order']
+    values = {field: value for field, value in updates.items() if field in allowed_fields}
     
-    for service in services:
-        for field, value in updates.items():
-            if field in allowed_fields:
-                setattr(service, field, value)
-                updated_count += 1
-        
-        service.updated_at = datetime.utcnow()
+    result = db.execute(
+        update(TenantServiceConfig)
+        .where(
+            and_(
+                TenantServiceConfig.tenant_id == tenant.id,
+                TenantServiceConfig.id.in_(service_ids)
+            )
+        )
+        .values(**values, updated_at=func.timezone("utc", func.now()))
+        .execution_options(synchronize_session=False)
+    )
+    updated_count = result.rowcount
     
     db.commit()
+    bump_tenant_cache_version(redis_client, SERVICE_LIST_CACHE, tenant.id)
     
-    logger.info(f"Bulk updated {len(services)} services for tenant {tenant.business_name}")
+    logger.info("Bulk updated {} services for tenant {}", updated_count, tenant.business_name)
     
     return {
-        "updated_services": len(services),
-        "message": f"Successfully updated {len(services)} services"
+        "updated_services": updated_count,
+        "message": f"Successfully updated {updated_count} services"
     }
 
 
 # Service Availability Management
 
 @router.get("/{service_id}/availability", response_model=Dict[str, Any])
-async def get_service_availability(
+def get_service_availability(
     service_id: UUID,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
@@ -613,14 +777,14 @@ async def get_service_availability(
         "availability_config": service.configuration.get("availability", {}),
         "schedules": [
             {
-                "id": str(schedule.id),
+                "id": schedule.id,
                 "day_of_week": schedule.day_of_week,
-                "day_name": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"][schedule.day_of_week],
+                "day_name": _DAY_NAMES[schedule.day_of_week],
                 "is_available": schedule.is_available,
-                "start_time": schedule.start_time.isoformat() if schedule.start_time else None,
-                "end_time": schedule.end_time.isoformat() if schedule.end_time else None,
+                "start_time": schedule.start_time,
+                "end_time": schedule.end_time,
                 "max_bookings": schedule.max_bookings,
-                "assigned_staff_id": str(schedule.assigned_staff_id) if schedule.assigned_staff_id else None,
+                "assigned_staff_id": schedule.assigned_staff_id,
                 "price_override": float(schedule.price_override) if schedule.price_override else None
             }
             for schedule in schedules
@@ -629,12 +793,13 @@ async def get_service_availability(
 
 
 @router.put("/{service_id}/availability", response_model=Dict[str, Any])
-async def update_service_availability(
+def update_service_availability(
     service_id: UUID,
     schedules: List[Dict[str, Any]] = Body(...),
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Update availability schedules for a service"""
     
@@ -651,31 +816,39 @@ async def update_service_availability(
             detail="Service not found"
         )
     
-    # Delete existing schedules
+    schedule_rows = [
+        {
+            "service_config_id": service.id,
+            "tenant_id": tenant.id,
+            "day_of_week": schedule_data["day_of_week"],
+            "is_available": schedule_data.get("is_available", True),
+            "start_time": schedule_data.get("start_time"),
+            "end_time": schedule_data.get("end_time"),
+            "max_bookings": schedule_data.get("max_bookings"),
+            "assigned_staff_id": schedule_data.get("assigned_staff_id"),
+            "price_override": schedule_data.get("price_override")
+        }
+        for schedule_data in schedules
+    ]
+    _require_unique([row["day_of_week"] for row in schedule_rows], "days of week")
+    
+    # Drop days no longer scheduled, upsert the rest by day of week
     db.query(ServiceSchedule).filter(
-        ServiceSchedule.service_config_id == service.id
-    ).delete()
-    
-    # Create new schedules
-    for schedule_data in schedules:
-        schedule = ServiceSchedule(
-            service_config_id=service.id,
-            tenant_id=tenant.id,
-            day_of_week=schedule_data["day_of_week"],
-            is_available=schedule_data.get("is_available", True),
-            start_time=schedule_data.get("start_time"),
-            end_time=schedule_data.get("end_time"),
-            max_bookings=schedule_data.get("max_bookings"),
-            assigned_staff_id=schedule_data.get("assigned_staff_id"),
-            price_override=schedule_data.get("price_override")
+        and_(
+            ServiceSchedule.service_config_id == service.id,
+            ServiceSchedule.day_of_week.notin_([row["day_of_week"] for row in schedule_rows])
         )
-        db.add(schedule)
+    ).delete(synchronize_session=False)
+    
+    if schedule_rows:
+        _upsert_rows(db, ServiceSchedule, schedule_rows, ["service_config_id", "day_of_week"])
     
-    service.updated_at = datetime.utcnow()
+    service.updated_at = func.timezone("utc", func.now())
     
     db.commit()
+    bump_tenant_cache_version(redis_client, SERVICE_LIST_CACHE, tenant.id)
     
-    logger.info(f"Updated availability for service '{service.name}' for tenant {tenant.business_name}")
+    logger.info("Updated availability for service '{}' for tenant {}", service.name, tenant.business_name)
     
     return {
         "service_id": str(service_id),
@@ -3,14 +3,23 @@ Admin settings management routes for BookingBot NG
 Handles business hours, payment settings, notifications, and general tenant configuration
 """
 
-from typing import List, Optional, Dict, Any
+from functools import lru_cache, wraps
+from threading import Lock
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Final, FrozenSet, Mapping, Type
 from uuid import UUID
-from datetime import datetime, time
+from datetime import datetime, date, time
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Body, UploadFile, File, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, select, update, bindparam, func
 from loguru import logger
+from cachetools import TTLCache
+import orjson
 from pydantic import BaseModel, Field
+from redis import Redis
 
 # Core imports
 from core.auth import (
@@ -18,31 +27,295 @@ from core.auth import (
     TenantUser, Tenant, User
 )
 from core.database import get_db
+from core.cache import get_redis, tenant_cache_key, bump_tenant_cache_version, cache_get, cache_set
 
 # Tenant imports
 from tenants.models import (
     BusinessProfile, BusinessDocument, NigerianBusinessCompliance,
     BusinessAddressSchema, BusinessContactSchema, BusinessHoursSchema,
     PaymentSettingsSchema, NotificationSettingsSchema, BrandingSchema,
-    get_nigerian_business_requirements
+    TenantServiceConfig, get_nigerian_business_requirements
 )
 
-router = APIRouter(prefix="/admin/settings", tags=["Admin Settings"])
+router = APIRouter(prefix="/admin/settings", tags=["Admin Settings"], default_response_class=ORJSONResponse)
+
+# Settings GET responses are cached per tenant and invalidated by every settings PUT
+SETTINGS_CACHE = "settings"
+SETTINGS_CACHE_TTL = 30
+
+# Per-tenant lookups built once at import and reused with bound parameters
+_BUSINESS_PROFILE_BY_TENANT = select(BusinessProfile).where(
+    BusinessProfile.tenant_id == bindparam("tenant_id")
+)
+# Expiry flags are computed in SQL, matching BusinessDocument.is_expired/days_until_expiry
+_DOCUMENTS_BY_PROFILE = select(
+    BusinessDocument,
+    func.coalesce(BusinessDocument.expiry_date < func.current_date(), False).label("is_expired"),
+    (BusinessDocument.expiry_date - func.current_date()).label("days_until_expiry")
+).where(
+    BusinessDocument.business_profile_id == bindparam("business_profile_id")
+).order_by(BusinessDocument.uploaded_at.desc())
+_COMPLIANCE_BY_TENANT = select(NigerianBusinessCompliance).where(
+    NigerianBusinessCompliance.tenant_id == bindparam("tenant_id")
+)
+
+# Document uploads: accepted types keyed to their leading magic bytes
+_DOCUMENT_SIGNATURES = {
+    "application/pdf": (b"%PDF",),
+    "image/jpeg": (b"\xff\xd8\xff",),
+    "image/jpg": (b"\xff\xd8\xff",),
+    "image/png": (b"\x89PNG\r\n\x1a\n",)
+}
+_MAX_DOCUMENT_SIZE = 10 * 1024 * 1024
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Scalar profile columns tenant admins may edit through PUT /profile
+_UPDATABLE_PROFILE_FIELDS: Final[FrozenSet[str]] = frozenset({
+    "business_size", "industry_specialization", "years_in_operation",
+    "cac_number", "tin", "business_registration_date", "tagline",
+    "description", "specialties", "certifications", "meta_title",
+    "meta_description", "keywords"
+})
+
+# Static defaults, built once and shared read-only across requests
+_DEFAULT_FEATURES: Final[Mapping[str, bool]] = MappingProxyType({
+    "online_booking": True,
+    "calendar_sync": True,
+    "sms_notifications": True,
+    "email_notifications": True,
+    "whatsapp_notifications": False,
+    "payment_processing": True,
+    "customer_reviews": True,
+    "staff_management": True,
+    "analytics_dashboard": True,
+    "custom_branding": False,
+    "api_access": False,
+    "priority_support": False
+})
+
+_RESTRICTED_FEATURES: Final[Mapping[str, FrozenSet[str]]] = MappingProxyType({
+    "basic": frozenset({"custom_branding", "api_access", "priority_support"}),
+    "pro": frozenset({"api_access", "priority_support"}),
+    "enterprise": frozenset()
+})
+
+_DEFAULT_ANALYTICS_CONFIG: Final[Mapping[str, Any]] = MappingProxyType({
+    "enable_customer_analytics": True,
+    "enable_revenue_tracking": True,
+    "enable_staff_performance": True,
+    "enable_service_analytics": True,
+    "data_retention_months": 24,
+    "export_formats": ("csv", "pdf"),
+    "automated_reports": MappingProxyType({
+        "daily_summary": True,
+        "weekly_report": True,
+        "monthly_report": True
+    }),
+    "dashboard_widgets": (
+        "total_bookings",
+        "revenue_chart",
+        "customer_satisfaction",
+        "staff_utilization"
+    )
+})
+
+
+def _schema_defaults(schema: Type[BaseModel], **values: Any) -> Mapping[str, Any]:
+    """JSON-ready defaults for a settings schema, built without running its validators"""
+    return MappingProxyType(jsonable_encoder(schema.construct(**values)))
+
+
+# Settings sections are validated on write, so GETs merge the stored JSON over
+# these defaults instead of rebuilding a Pydantic model per request
+_DEFAULT_ADDRESS: Final = _schema_defaults(
+    BusinessAddressSchema, street_address="", city="", state="", country="Nigeria"
+)
+_DEFAULT_CONTACT: Final = _schema_defaults(BusinessContactSchema, primary_phone="", primary_email=None)
+_DEFAULT_HOURS: Final = _schema_defaults(
+    BusinessHoursSchema,
+    monday={"open": "08:00", "close": "17:00"},
+    tuesday={"open": "08:00", "close": "17:00"},
+    wednesday={"open": "08:00", "close": "17:00"},
+    thursday={"open": "08:00", "close": "17:00"},
+    friday={"open": "08:00", "close": "17:00"},
+    saturday={"open": "09:00", "close": "15:00"},
+    sunday=None,
+    timezone="Africa/Lagos"
+)
+_DEFAULT_PAYMENT: Final = _schema_defaults(PaymentSettingsSchema)
+_DEFAULT_NOTIFICATIONS: Final = _schema_defaults(NotificationSettingsSchema)
+_DEFAULT_BRANDING: Final = _schema_defaults(BrandingSchema)
+
+
+# Response Schemas
+
+class BusinessProfileResponseSchema(BaseModel):
+    """Complete business profile as returned to tenant admins"""
+    id: UUID
+    business_type: str
+    business_size: Optional[str]
+    industry_specialization: Optional[str]
+    years_in_operation: Optional[int]
+    cac_number: Optional[str]
+    tin: Optional[str]
+    business_registration_date: Optional[date]
+    verification_status: Optional[str]
+    verification_date: Optional[datetime]
+    tagline: Optional[str]
+    description: Optional[str]
+    specialties: Optional[List[str]]
+    certifications: Optional[List[Any]]
+    address: Dict[str, Any]
+    contact_info: Dict[str, Any]
+    business_hours: Dict[str, Any]
+    payment_settings: Dict[str, Any]
+    notification_settings: Dict[str, Any]
+    branding: Dict[str, Any]
+    max_staff: Optional[int]
+    max_daily_bookings: Optional[int]
+    max_services: Optional[int]
+    total_bookings: Optional[int]
+    total_revenue: float
+    customer_rating: Optional[float]
+    review_count: Optional[int]
+    meta_title: Optional[str]
+    meta_description: Optional[str]
+    keywords: Optional[List[str]]
+    features_enabled: Optional[Dict[str, bool]]
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        orm_mode = True
+
+
+# Dependencies
+
+class BusinessProfileLoader:
+    """Loads the tenant's business profile on first use and reuses it for the rest of the request"""
+    
+    def __init__(
+        self,
+        tenant: Tenant = Depends(get_current_tenant),
+        db: Session = Depends(get_db)
+    ):
+        self.tenant = tenant
+        self.db = db
+        self._business_profile: Optional[BusinessProfile] = None
+        self._loaded = False
+    
+    def get(self) -> Optional[BusinessProfile]:
+        """Return the business profile, querying it at most once"""
+        if not self._loaded:
+            self._business_profile = self.db.execute(
+                _BUSINESS_PROFILE_BY_TENANT, {"tenant_id": self.tenant.id}
+            ).scalars().first()
+            self._loaded = True
+        return self._business_profile
+
+
+def _update_business_profile_columns(db: Session, tenant: Tenant, **values: Any) -> None:
+    """Write settings columns straight to the tenant's profile row without loading it"""
+    result = db.execute(
+        update(BusinessProfile)
+        .where(BusinessProfile.tenant_id == tenant.id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business profile not found"
+        )
+
+
+@lru_cache(maxsize=128)
+def _parse_hhmm(value: str) -> time:
+    """Parse an "HH:MM" opening time; the handful of distinct values repeat across days and tenants"""
+    hour, minute = value.split(":")
+    return time(int(hour), int(minute))
+
+
+# Caching
+
+def cached_settings(section: str):
+    """
+    Cache a settings GET handler's JSON response in Redis.
+    
+    The handler must take `tenant` and `redis_client` parameters. Cache hits
+    are returned as-is without running the handler or touching the database.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(*args, **kwargs):
+            redis_client = kwargs["redis_client"]
+            cache_key = tenant_cache_key(redis_client, SETTINGS_CACHE, kwargs["tenant"].id, section)
+            if cache_key:
+                cached = cache_get(redis_client, cache_key)
+                if cached is not None:
+                    return Response(content=cached, media_type="application/json")
+            
+            payload = handler(*args, **kwargs)
+            if isinstance(payload, BaseModel):
+                # Schemas may carry Decimal fields, which orjson does not serialize
+                payload = jsonable_encoder(payload)
+            response = ORJSONResponse(payload)
+            if cache_key:
+                cache_set(redis_client, cache_key, response.body, SETTINGS_CACHE_TTL)
+            return response
+        return wrapper
+    return decorator
+
+
+# Feature flags are checked far more often than they change, so each worker keeps
+# a short-lived copy in front of Redis. Other workers pick up a change when their
+# entry expires, which is no later than the Redis entry itself.
+_features_cache: TTLCache = TTLCache(maxsize=10_000, ttl=SETTINGS_CACHE_TTL)
+_features_cache_lock = Lock()
+
+
+def get_tenant_features(db: Session, redis_client: Redis, tenant_id: UUID) -> Mapping[str, bool]:
+    """Effective feature flags for a tenant, read through the in-process and Redis caches"""
+    with _features_cache_lock:
+        features = _features_cache.get(tenant_id)
+    if features is not None:
+        return features
+    
+    cache_key = tenant_cache_key(redis_client, SETTINGS_CACHE, tenant_id, "feature_flags")
+    cached = cache_get(redis_client, cache_key) if cache_key else None
+    
+    if cached is not None:
+        flags = orjson.loads(cached)
+    else:
+        saved_features = db.execute(
+            select(BusinessProfile.features_enabled).where(BusinessProfile.tenant_id == tenant_id)
+        ).scalar()
+        # Saved flags override the defaults
+        flags = {**_DEFAULT_FEATURES, **(saved_features or {})}
+        if cache_key:
+            cache_set(redis_client, cache_key, orjson.dumps(flags), SETTINGS_CACHE_TTL)
+    
+    features = MappingProxyType(flags)
+    with _features_cache_lock:
+        _features_cache[tenant_id] = features
+    return features
 
 
 # Business Profile Management
 
-@router.get("/profile", response_model=Dict[str, Any])
-async def get_business_profile(
+@router.get("/profile", response_model=BusinessProfileResponseSchema)
+@cached_settings("profile")
+def get_business_profile(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Get complete business profile"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
     
     if not business_profile:
         # Create default business profile
@@ -60,240 +333,169 @@ async def get_business_profile(
         db.commit()
         db.refresh(business_profile)
     
-    return {
-        "id": str(business_profile.id),
-        "business_type": business_profile.business_type,
-        "business_size": business_profile.business_size,
-        "industry_specialization": business_profile.industry_specialization,
-        "years_in_operation": business_profile.years_in_operation,
-        "cac_number": business_profile.cac_number,
-        "tin": business_profile.tin,
-        "business_registration_date": business_profile.business_registration_date.isoformat() if business_profile.business_registration_date else None,
-        "verification_status": business_profile.verification_status,
-        "verification_date": business_profile.verification_date.isoformat() if business_profile.verification_date else None,
-        "tagline": business_profile.tagline,
-        "description": business_profile.description,
-        "specialties": business_profile.specialties,
-        "certifications": business_profile.certifications,
-        "address": business_profile.address,
-        "contact_info": business_profile.contact_info,
-        "business_hours": business_profile.business_hours,
-        "payment_settings": business_profile.payment_settings,
-        "notification_settings": business_profile.notification_settings,
-        "branding": business_profile.branding,
-        "max_staff": business_profile.max_staff,
-        "max_daily_bookings": business_profile.max_daily_bookings,
-        "max_services": business_profile.max_services,
-        "total_bookings": business_profile.total_bookings,
-        "total_revenue": float(business_profile.total_revenue),
-        "customer_rating": float(business_profile.customer_rating) if business_profile.customer_rating else None,
-        "review_count": business_profile.review_count,
-        "meta_title": business_profile.meta_title,
-        "meta_description": business_profile.meta_description,
-        "keywords": business_profile.keywords,
-        "features_enabled": business_profile.features_enabled,
-        "created_at": business_profile.created_at.isoformat(),
-        "updated_at": business_profile.updated_at.isoformat()
-    }
+    return BusinessProfileResponseSchema.from_orm(business_profile)
 
 
-@router.put("/profile", response_model=Dict[str, Any])
-async def update_business_profile(
+@router.put("/profile")
+def update_business_profile(
     profile_data: Dict[str, Any] = Body(...),
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Update business profile"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
-    
-    if not business_profile:
+    values = {
+        field: value
+        for field, value in profile_data.items()
+        if field in _UPDATABLE_PROFILE_FIELDS
+    }
+    registration_date = values.get("business_registration_date")
+    if registration_date and isinstance(registration_date, str):
+        values["business_registration_date"] = date.fromisoformat(registration_date)
+    
+    # Patch only the submitted columns in place; the wide JSON columns are never read or rewritten
+    updated_at = db.execute(
+        update(BusinessProfile)
+        .where(BusinessProfile.tenant_id == tenant.id)
+        .values(**values)
+        .returning(BusinessProfile.updated_at)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    
+    if updated_at is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Business profile not found"
         )
     
-    # Update allowed fields
-    updatable_fields = [
-        'business_size', 'industry_specialization', 'years_in_operation',
-        'cac_number', 'tin', 'business_registration_date', 'tagline',
-        'description', 'specialties', 'certifications', 'meta_title',
-        'meta_description', 'keywords'
-    ]
-    
-    for field, value in profile_data.items():
-        if field in updatable_fields and hasattr(business_profile, field):
-            if field == 'business_registration_date' and value:
-                # Parse date string
-                from datetime import date
-                if isinstance(value, str):
-                    value = date.fromisoformat(value)
-            setattr(business_profile, field, value)
-    
-    business_profile.updated_at = datetime.utcnow()
-    
     db.commit()
-    db.refresh(business_profile)
+    bump_tenant_cache_version(redis_client, SETTINGS_CACHE, tenant.id)
     
     logger.info(f"Updated business profile for tenant {tenant.business_name}")
     
-    return {
+    return ORJSONResponse({
         "message": "Business profile updated successfully",
-        "updated_at": business_profile.updated_at.isoformat()
-    }
+        "updated_at": updated_at
+    })
 
 
 # Address Management
 
 @router.get("/address", response_model=BusinessAddressSchema)
-async def get_business_address(
+@cached_settings("address")
+def get_business_address(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Get business address"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
     
-    if not business_profile or not business_profile.address:
-        return BusinessAddressSchema(
-            street_address="",
-            city="",
-            state="",
-            country="Nigeria"
-        )
+    stored = business_profile.address if business_profile else None
     
-    return BusinessAddressSchema(**business_profile.address)
+    return {**_DEFAULT_ADDRESS, **(stored or {})}
 
 
-@router.put("/address", response_model=Dict[str, Any])
-async def update_business_address(
+@router.put("/address")
+def update_business_address(
     address: BusinessAddressSchema,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Update business address"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
-    
-    if not business_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Business profile not found"
-        )
-    
-    business_profile.address = address.dict()
-    business_profile.updated_at = datetime.utcnow()
+    _update_business_profile_columns(db, tenant, address=address.dict())
     
     db.commit()
+    bump_tenant_cache_version(redis_client, SETTINGS_CACHE, tenant.id)
     
     logger.info(f"Updated business address for tenant {tenant.business_name}")
     
-    return {"message": "Business address updated successfully"}
+    return ORJSONResponse({"message": "Business address updated successfully"})
 
 
 # Contact Information
 
 @router.get("/contact", response_model=BusinessContactSchema)
-async def get_business_contact(
+@cached_settings("contact")
+def get_business_contact(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Get business contact information"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
     
-    if not business_profile or not business_profile.contact_info:
-        return BusinessContactSchema(
-            primary_phone="",
-            primary_email=tenant.email
-        )
+    stored = business_profile.contact_info if business_profile else None
+    
+    if not stored:
+        return {**_DEFAULT_CONTACT, "primary_email": tenant.email}
     
-    return BusinessContactSchema(**business_profile.contact_info)
+    return {**_DEFAULT_CONTACT, **stored}
 
 
-@router.put("/contact", response_model=Dict[str, Any])
-async def update_business_contact(
+@router.put("/contact")
+def update_business_contact(
     contact: BusinessContactSchema,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Update business contact information"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
-    
-    if not business_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Business profile not found"
-        )
-    
-    business_profile.contact_info = contact.dict()
-    business_profile.updated_at = datetime.utcnow()
+    _update_business_profile_columns(db, tenant, contact_info=contact.dict())
     
     db.commit()
+    bump_tenant_cache_version(redis_client, SETTINGS_CACHE, tenant.id)
     
     logger.info(f"Updated business contact for tenant {tenant.business_name}")
     
-    return {"message": "Business contact updated successfully"}
+    return ORJSONResponse({"message": "Business contact updated successfully"})
 
 
 # Business Hours
 
 @router.get("/hours", response_model=BusinessHoursSchema)
-async def get_business_hours(
+@cached_settings("hours")
+def get_business_hours(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Get business hours"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
     
-    if not business_profile or not business_profile.business_hours:
-        # Return default hours
-        return BusinessHoursSchema(
-            monday={"open": "08:00", "close": "17:00"},
-            tuesday={"open": "08:00", "close": "17:00"},
-            wednesday={"open": "08:00", "close": "17:00"},
-            thursday={"open": "08:00", "close": "17:00"},
-            friday={"open": "08:00", "close": "17:00"},
-            saturday={"open": "09:00", "close": "15:00"},
-            sunday=None,
-            timezone="Africa/Lagos"
-        )
+    stored = business_profile.business_hours if business_profile else None
     
-    return BusinessHoursSchema(**business_profile.business_hours)
+    return {**_DEFAULT_HOURS, **(stored or {})}
 
 
-@router.put("/hours", response_model=Dict[str, Any])
-async def update_business_hours(
+@router.put("/hours")
+def update_business_hours(
     hours: BusinessHoursSchema,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Update business hours"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
     
     if not business_profile:
         raise HTTPException(
@@ -302,254 +504,209 @@ async def update_business_hours(
         )
     
     business_profile.business_hours = hours.dict()
-    business_profile.updated_at = datetime.utcnow()
     
     # Update core business hours table
     from core.scheduling import BusinessHours as CoreBusinessHours
     
-    # Delete existing core business hours
-    db.query(CoreBusinessHours).filter(
-        CoreBusinessHours.tenant_id == tenant.id
-    ).delete()
+    # Replace core business hours with one DELETE and one multi-row INSERT
+    db.execute(delete(CoreBusinessHours).where(CoreBusinessHours.tenant_id == tenant.id))
     
-    # Create new core business hours
     days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+    rows = []
     for day_index, day_name in enumerate(days):
         day_hours = getattr(hours, day_name)
-        if day_hours:
-            core_hours = CoreBusinessHours(
-                tenant_id=tenant.id,
-                day_of_week=day_index,
-                is_open=True,
-                open_time=time.fromisoformat(day_hours["open"]),
-                close_time=time.fromisoformat(day_hours["close"]),
-                observes_public_holidays=hours.ramadan_hours is not None
-            )
-            db.add(core_hours)
-        else:
-            # Day is closed
-            core_hours = CoreBusinessHours(
-                tenant_id=tenant.id,
-                day_of_week=day_index,
-                is_open=False
-            )
-            db.add(core_hours)
+        rows.append({
+            "tenant_id": tenant.id,
+            "day_of_week": day_index,
+            "is_open": bool(day_hours),
+            "open_time": _parse_hhmm(day_hours["open"]) if day_hours else None,
+            "close_time": _parse_hhmm(day_hours["close"]) if day_hours else None,
+            # Closed days keep the column default
+            "observes_public_holidays": hours.ramadan_hours is not None if day_hours else True
+        })
+    db.execute(insert(CoreBusinessHours).values(rows))
     
     db.commit()
+    bump_tenant_cache_version(redis_client, SETTINGS_CACHE, tenant.id)
     
     logger.info(f"Updated business hours for tenant {tenant.business_name}")
     
-    return {"message": "Business hours updated successfully"}
+    return ORJSONResponse({"message": "Business hours updated successfully"})
 
 
 # Payment Settings
 
 @router.get("/payment", response_model=PaymentSettingsSchema)
-async def get_payment_settings(
+@cached_settings("payment")
+def get_payment_settings(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Get payment settings"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
     
-    if not business_profile or not business_profile.payment_settings:
-        return PaymentSettingsSchema(
-            accepts_cash=True,
-            accepts_card=True,
-            accepts_bank_transfer=True,
-            paystack_enabled=True,
-            currency="NGN"
-        )
+    stored = business_profile.payment_settings if business_profile else None
     
-    return PaymentSettingsSchema(**business_profile.payment_settings)
+    return {**_DEFAULT_PAYMENT, **(stored or {})}
 
 
-@router.put("/payment", response_model=Dict[str, Any])
-async def update_payment_settings(
+@router.put("/payment")
+def update_payment_settings(
     payment_settings: PaymentSettingsSchema,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Update payment settings"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
-    
-    if not business_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Business profile not found"
-        )
-    
-    business_profile.payment_settings = payment_settings.dict()
-    business_profile.updated_at = datetime.utcnow()
+    _update_business_profile_columns(db, tenant, payment_settings=payment_settings.dict())
     
     db.commit()
+    bump_tenant_cache_version(redis_client, SETTINGS_CACHE, tenant.id)
     
     logger.info(f"Updated payment settings for tenant {tenant.business_name}")
     
-    return {"message": "Payment settings updated successfully"}
+    return ORJSONResponse({"message": "Payment settings updated successfully"})
 
 
 # Notification Settings
 
 @router.get("/notifications", response_model=NotificationSettingsSchema)
-async def get_notification_settings(
+@cached_settings("notifications")
+def get_notification_settings(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Get notification settings"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
     
-    if not business_profile or not business_profile.notification_settings:
-        return NotificationSettingsSchema()
+    stored = business_profile.notification_settings if business_profile else None
     
-    return NotificationSettingsSchema(**business_profile.notification_settings)
+    return {**_DEFAULT_NOTIFICATIONS, **(stored or {})}
 
 
-@router.put("/notifications", response_model=Dict[str, Any])
-async def update_notification_settings(
+@router.put("/notifications")
+def update_notification_settings(
     notification_settings: NotificationSettingsSchema,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Update notification settings"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
-    
-    if not business_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Business profile not found"
-        )
-    
-    business_profile.notification_settings = notification_settings.dict()
-    business_profile.updated_at = datetime.utcnow()
+    _update_business_profile_columns(db, tenant, notification_settings=notification_settings.dict())
     
     db.commit()
+    bump_tenant_cache_version(redis_client, SETTINGS_CACHE, tenant.id)
     
     logger.info(f"Updated notification settings for tenant {tenant.business_name}")
     
-    return {"message": "Notification settings updated successfully"}
+    return ORJSONResponse({"message": "Notification settings updated successfully"})
 
 
 # Branding Settings
 
 @router.get("/branding", response_model=BrandingSchema)
-async def get_branding_settings(
+@cached_settings("branding")
+def get_branding_settings(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Get branding settings"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
     
-    if not business_profile or not business_profile.branding:
-        return BrandingSchema()
+    stored = business_profile.branding if business_profile else None
     
-    return BrandingSchema(**business_profile.branding)
+    return {**_DEFAULT_BRANDING, **(stored or {})}
 
 
-@router.put("/branding", response_model=Dict[str, Any])
-async def update_branding_settings(
+@router.put("/branding")
+def update_branding_settings(
     branding_settings: BrandingSchema,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Update branding settings"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
-    
-    if not business_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Business profile not found"
-        )
-    
-    business_profile.branding = branding_settings.dict()
-    business_profile.updated_at = datetime.utcnow()
+    _update_business_profile_columns(db, tenant, branding=branding_settings.dict())
     
     db.commit()
+    bump_tenant_cache_version(redis_client, SETTINGS_CACHE, tenant.id)
     
     logger.info(f"Updated branding settings for tenant {tenant.business_name}")
     
-    return {"message": "Branding settings updated successfully"}
+    return ORJSONResponse({"message": "Branding settings updated successfully"})
 
 
 # Document Management
 
 @router.get("/documents", response_model=List[Dict[str, Any]])
-async def list_business_documents(
+def list_business_documents(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Get list of business documents"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
     
     if not business_profile:
         return []
     
-    documents = db.query(BusinessDocument).filter(
-        BusinessDocument.business_profile_id == business_profile.id
-    ).order_by(BusinessDocument.uploaded_at.desc()).all()
+    rows = db.execute(
+        _DOCUMENTS_BY_PROFILE, {"business_profile_id": business_profile.id}
+    ).all()
     
     return [
         {
-            "id": str(doc.id),
+            "id": doc.id,
             "document_type": doc.document_type,
             "document_name": doc.document_name,
             "file_url": doc.file_url,
             "file_size": doc.file_size,
             "file_type": doc.file_type,
             "is_verified": doc.is_verified,
-            "verified_at": doc.verified_at.isoformat() if doc.verified_at else None,
+            "verified_at": doc.verified_at,
             "verification_notes": doc.verification_notes,
-            "expiry_date": doc.expiry_date.isoformat() if doc.expiry_date else None,
-            "is_expired": doc.is_expired(),
-            "days_until_expiry": doc.days_until_expiry(),
-            "uploaded_at": doc.uploaded_at.isoformat()
+            "expiry_date": doc.expiry_date,
+            "is_expired": is_expired,
+            "days_until_expiry": days_until_expiry,
+            "uploaded_at": doc.uploaded_at
         }
-        for doc in documents
+        for doc, is_expired, days_until_expiry in rows
     ]
 
 
 @router.post("/documents/upload", response_model=Dict[str, Any])
-async def upload_business_document(
+def upload_business_document(
     document_type: str = Body(...),
     document_name: str = Body(...),
     file: UploadFile = File(...),
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Upload a business document"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
     
     if not business_profile:
         raise HTTPException(
@@ -558,21 +715,40 @@ async def upload_business_document(
         )
     
     # Validate file type
-    allowed_types = ['application/pdf', 'image/jpeg', 'image/png', 'image/jpg']
-    if file.content_type not in allowed_types:
+    signatures = _DOCUMENT_SIGNATURES.get(file.content_type)
+    if not signatures:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid file type. Only PDF and image files are allowed."
         )
     
-    # Validate file size (max 10MB)
-    if file.size > 10 * 1024 * 1024:
+    chunk = file.file.read(_UPLOAD_CHUNK_SIZE)
+    if not chunk:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File size too large. Maximum size is 10MB."
+            detail="File is empty."
         )
     
-    # TODO: Implement actual file upload to cloud storage
+    if not chunk.startswith(signatures):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File content does not match its declared type."
+        )
+    
+    # Stream the body in chunks, enforcing the size limit on bytes actually received
+    file_size = 0
+    while chunk:
+        file_size += len(chunk)
+        if file_size > _MAX_DOCUMENT_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="File size too large. Maximum size is 10MB."
+            )
+        
+        # TODO: Forward each chunk to cloud storage
+        
+        chunk = file.file.read(_UPLOAD_CHUNK_SIZE)
+    
     # For now, we'll simulate the upload
     file_url = f"https://storage.bookingbot.ng/documents/{tenant.id}/{file.filename}"
     
@@ -583,7 +759,7 @@ async def upload_business_document(
         document_type=document_type,
         document_name=document_name,
         file_url=file_url,
-        file_size=file.size,
+        file_size=file_size,
         file_type=file.content_type
     )
     
@@ -603,7 +779,7 @@ async def upload_business_document(
 
 
 @router.delete("/documents/{document_id}")
-async def delete_business_document(
+def delete_business_document(
     document_id: UUID,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
@@ -612,10 +788,8 @@ async def delete_business_document(
     """Delete a business document"""
     
     document = db.query(BusinessDocument).filter(
-        and_(
-            BusinessDocument.id == document_id,
-            BusinessDocument.tenant_id == tenant.id
-        )
+        BusinessDocument.id == document_id,
+        BusinessDocument.tenant_id == tenant.id
     ).first()
     
     if not document:
@@ -631,39 +805,36 @@ async def delete_business_document(
     
     logger.info(f"Deleted document '{document.document_name}' for tenant {tenant.business_name}")
     
-    return {"message": "Document deleted successfully"}
+    return ORJSONResponse({"message": "Document deleted successfully"})
 
 
 # Nigerian Business Compliance
 
 @router.get("/compliance", response_model=Dict[str, Any])
-async def get_compliance_status(
+def get_compliance_status(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Get Nigerian business compliance status"""
     
-    compliance = db.query(NigerianBusinessCompliance).filter(
-        NigerianBusinessCompliance.tenant_id == tenant.id
-    ).first()
+    compliance = db.execute(
+        _COMPLIANCE_BY_TENANT, {"tenant_id": tenant.id}
+    ).scalars().first()
     
     if not compliance:
         # Create default compliance record
         compliance = NigerianBusinessCompliance(
             tenant_id=tenant.id,
-            business_profile_id=db.query(BusinessProfile).filter(
-                BusinessProfile.tenant_id == tenant.id
-            ).first().id
+            business_profile_id=profiles.get().id
         )
         db.add(compliance)
         db.commit()
         db.refresh(compliance)
     
     # Get requirements for business type
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
     
     requirements = get_nigerian_business_requirements(
         business_profile.business_type if business_profile else "consulting"
@@ -675,71 +846,46 @@ async def get_compliance_status(
     return {
         "compliance_score": compliance_score,
         "cac_status": compliance.cac_status,
-        "cac_verified_date": compliance.cac_verified_date.isoformat() if compliance.cac_verified_date else None,
+        "cac_verified_date": compliance.cac_verified_date,
         "tin_status": compliance.tin_status,
-        "tax_clearance_expiry": compliance.tax_clearance_expiry.isoformat() if compliance.tax_clearance_expiry else None,
+        "tax_clearance_expiry": compliance.tax_clearance_expiry,
         "business_permit_status": compliance.business_permit_status,
-        "business_permit_expiry": compliance.business_permit_expiry.isoformat() if compliance.business_permit_expiry else None,
+        "business_permit_expiry": compliance.business_permit_expiry,
         "industry_licenses": compliance.industry_licenses,
         "professional_memberships": compliance.professional_memberships,
-        "last_compliance_check": compliance.last_compliance_check.isoformat() if compliance.last_compliance_check else None,
-        "requirements": requirements,
-        "created_at": compliance.created_at.isoformat(),
-        "updated_at": compliance.updated_at.isoformat()
+        "last_compliance_check": compliance.last_compliance_check,
+        "requirements": {name: dict(requirement) for name, requirement in requirements.items()},
+        "created_at": compliance.created_at,
+        "updated_at": compliance.updated_at
     }
 
 
 # Feature Flags and Configuration
 
 @router.get("/features", response_model=Dict[str, Any])
-async def get_feature_flags(
+def get_feature_flags(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Get enabled features for the tenant"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
-    
-    default_features = {
-        "online_booking": True,
-        "calendar_sync": True,
-        "sms_notifications": True,
-        "email_notifications": True,
-        "whatsapp_notifications": False,
-        "payment_processing": True,
-        "customer_reviews": True,
-        "staff_management": True,
-        "analytics_dashboard": True,
-        "custom_branding": False,
-        "api_access": False,
-        "priority_support": False
-    }
-    
-    if not business_profile or not business_profile.features_enabled:
-        return {"features": default_features}
-    
-    # Merge with saved features
-    enabled_features = default_features.copy()
-    enabled_features.update(business_profile.features_enabled)
-    
-    return {"features": enabled_features}
+    return ORJSONResponse({"features": dict(get_tenant_features(db, redis_client, tenant.id))})
 
 
-@router.put("/features", response_model=Dict[str, Any])
-async def update_feature_flags(
+@router.put("/features")
+def update_feature_flags(
     features: Dict[str, bool] = Body(...),
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Update enabled features for the tenant"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
     
     if not business_profile:
         raise HTTPException(
@@ -750,13 +896,7 @@ async def update_feature_flags(
     # Validate features based on subscription tier
     subscription_tier = tenant.subscription_tier or "basic"
     
-    restricted_features = {
-        "basic": ["custom_branding", "api_access", "priority_support"],
-        "pro": ["api_access", "priority_support"],
-        "enterprise": []
-    }
-    
-    restricted = restricted_features.get(subscription_tier, [])
+    restricted = _RESTRICTED_FEATURES.get(subscription_tier, frozenset())
     
     for feature, enabled in features.items():
         if enabled and feature in restricted:
@@ -766,63 +906,58 @@ async def update_feature_flags(
             )
     
     business_profile.features_enabled = features
-    business_profile.updated_at = datetime.utcnow()
     
     db.commit()
+    bump_tenant_cache_version(redis_client, SETTINGS_CACHE, tenant.id)
+    with _features_cache_lock:
+        _features_cache.pop(tenant.id, None)
     
     logger.info(f"Updated feature flags for tenant {tenant.business_name}")
     
-    return {"message": "Feature flags updated successfully"}
+    return ORJSONResponse({"message": "Feature flags updated successfully"})
 
 
 # Analytics and Reports Settings
 
 @router.get("/analytics-config", response_model=Dict[str, Any])
-async def get_analytics_config(
+def get_analytics_config(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db)
 ):
     """Get analytics and reporting configuration"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
-    
-    default_config = {
-        "enable_customer_analytics": True,
-        "enable_revenue_tracking": True,
-        "enable_staff_performance": True,
-        "enable_service_analytics": True,
-        "data_retention_months": 24,
-        "export_formats": ["csv", "pdf"],
-        "automated_reports": {
-            "daily_summary": True,
-            "weekly_report": True,
-            "monthly_report": True
-        },
-        "dashboard_widgets": [
-            "total_bookings",
-            "revenue_chart",
-            "customer_satisfaction",
-            "staff_utilization"
-        ]
-    }
-    
-    return {"analytics_config": default_config}
+    return {"analytics_config": _DEFAULT_ANALYTICS_CONFIG}
 
 
+# Not cached: the usage counts change through the staff and service routes,
+# which do not bump the settings namespace
 @router.get("/subscription", response_model=Dict[str, Any])
-async def get_subscription_info(
+def get_subscription_info(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    profiles: BusinessProfileLoader = Depends()
 ):
     """Get current subscription information"""
     
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+    business_profile = profiles.get()
+    
+    # Both usage counts in one round trip
+    usage = db.execute(
+        select(
+            select(func.count())
+            .select_from(TenantUser)
+            .where(TenantUser.tenant_id == tenant.id, TenantUser.is_active == True)
+            .scalar_subquery()
+            .label("staff_count"),
+            select(func.count())
+            .select_from(TenantServiceConfig)
+            .where(TenantServiceConfig.tenant_id == tenant.id, TenantServiceConfig.is_active == True)
+            .scalar_subquery()
+            .label("service_count")
+        )
+    ).one()
     
     return {
         "subscription_tier": tenant.subscription_tier,
@@ -830,17 +965,7 @@ async def get_subscription_info(
         "max_daily_bookings": business_profile.max_daily_bookings if business_profile else 50,
         "max_services": business_profile.max_services if business_profile else 10,
         "current_usage": {
-            "staff_count": db.query(TenantUser).filter(
-                and_(
-                    TenantUser.tenant_id == tenant.id,
-                    TenantUser.is_active == True
-                )
-            ).count(),
-            "service_count": db.query(TenantServiceConfig).filter(
-                and_(
-                    TenantServiceConfig.tenant_id == tenant.id,
-                    TenantServiceConfig.is_active == True
-                )
-            ).count()
+            "staff_count": usage.staff_count,
+            "service_count": usage.service_count
         }
     }
\ No newline at end of file
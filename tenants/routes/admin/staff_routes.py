@@ -3,15 +3,20 @@ Admin staff management routes for BookingBot NG
 Handles CRUD operations for tenant staff members, roles, and permissions
 """
 
-from typing import List, Optional, Dict, Any
+import base64
+import json
+from typing import Final, List, Optional, Dict, Any, Tuple
 from uuid import UUID
-from datetime import datetime, date
+from datetime import datetime, date, time
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, contains_eager, defer, joinedload, raiseload
+from sqlalchemy import and_, or_, desc, asc, func, update, select, exists, case, tuple_
 from loguru import logger
 from pydantic import BaseModel, Field
+from pydantic.utils import GetterDict
+from redis import Redis
 
 # Core imports
 from core.auth import (
@@ -19,11 +24,20 @@ from core.auth import (
     TenantUser, Tenant, User, UserRole, TenantService, TenantInvitation
 )
 from core.database import get_db
+from core.cache import get_redis, tenant_cache_key, cache_get, cache_set
 
 # Tenant imports
 from tenants.models import BusinessProfile
 
-router = APIRouter(prefix="/admin/staff", tags=["Admin Staff"])
+router = APIRouter(prefix="/admin/staff", tags=["Admin Staff"], default_response_class=ORJSONResponse)
+
+# Staff limits only change with the subscription; bump this namespace's
+# tenant version when BusinessProfile.max_staff is changed
+STAFF_LIMIT_CACHE = "staff_limit"
+STAFF_LIMIT_CACHE_TTL = 300
+
+# working_hours keys, indexed by StaffScheduleSchema.day_of_week (0=Monday)
+_WORKING_HOURS_DAYS: Final = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
 
 
 # Pydantic Schemas for Staff Management
@@ -87,9 +101,199 @@ class StaffScheduleSchema(BaseModel):
     notes: Optional[str] = Field(None, max_length=500)
 
 
+# Response Schemas
+
+class _StaffMemberGetter(GetterDict):
+    """Reads account fields from TenantUser.user so a membership validates as one flat schema"""
+    
+    _USER_FIELDS = frozenset({"email", "first_name", "last_name", "full_name", "phone", "last_login"})
+    
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key in self._USER_FIELDS:
+            return getattr(self._obj.user, key, default)
+        return getattr(self._obj, key, default)
+
+
+class StaffMemberSchema(BaseModel):
+    """Staff member as listed to tenant admins"""
+    id: UUID
+    user_id: UUID
+    email: str
+    first_name: str
+    last_name: str
+    full_name: str
+    phone: Optional[str]
+    role: str
+    staff_title: Optional[str]
+    specializations: Optional[List[str]]
+    bio: Optional[str]
+    profile_image_url: Optional[str]
+    working_hours: Optional[Dict[str, Any]]
+    is_accepting_bookings: Optional[bool]
+    is_active: Optional[bool]
+    joined_at: datetime
+    last_login: Optional[datetime]
+    
+    class Config:
+        orm_mode = True
+        getter_dict = _StaffMemberGetter
+
+
+class StaffDetailSchema(StaffMemberSchema):
+    """Single staff member with preferences and recent performance"""
+    notification_preferences: Optional[Dict[str, Any]]
+    performance_metrics: Optional[Dict[str, Any]]
+
+
+class StaffListSchema(BaseModel):
+    """Paginated staff listing"""
+    staff: List[StaffMemberSchema]
+    total_count: Optional[int]
+    limit: int
+    offset: int
+    next_cursor: Optional[str]
+
+
+class StaffInvitationSchema(BaseModel):
+    """Staff invitation as listed to tenant admins"""
+    id: UUID
+    email: str
+    phone: Optional[str]
+    invited_role: str
+    status: Optional[str]
+    suggested_name: Optional[str]
+    created_at: datetime
+    expires_at: datetime
+    accepted_at: Optional[datetime]
+    
+    class Config:
+        orm_mode = True
+
+
+# Owners first, then admins, then everyone else
+_ROLE_RANKS = {UserRole.TENANT_OWNER.value: 0, UserRole.TENANT_ADMIN.value: 1}
+_DEFAULT_ROLE_RANK = 2
+_ROLE_RANK = case(_ROLE_RANKS, value=TenantUser.role, else_=_DEFAULT_ROLE_RANK)
+
+
+def _encode_cursor(staff: TenantUser) -> str:
+    """Encode a staff member's listing sort key as an opaque page cursor"""
+    key = [
+        _ROLE_RANKS.get(staff.role, _DEFAULT_ROLE_RANK),
+        staff.user.first_name,
+        staff.user.last_name,
+        str(staff.id)
+    ]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, str, str, UUID]:
+    """Decode a page cursor produced by _encode_cursor"""
+    try:
+        role_rank, first_name, last_name, staff_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(role_rank), str(first_name), str(last_name), UUID(staff_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+# Role permission bits; a member is off-limits when its bit is in the caller's protected mask
+_OWNER_BIT, _ADMIN_BIT, _STAFF_BIT = 1, 2, 4
+_ROLE_BITS = {
+    UserRole.TENANT_OWNER.value: _OWNER_BIT,
+    UserRole.TENANT_ADMIN.value: _ADMIN_BIT,
+    UserRole.STAFF.value: _STAFF_BIT
+}
+
+
+def _protected_role_mask(actor_role: Optional[str]) -> int:
+    """Roles the caller may not manage: the owner always, admins unless the caller is the owner"""
+    if _ROLE_BITS.get(actor_role) == _OWNER_BIT:
+        return _OWNER_BIT
+    return _OWNER_BIT | _ADMIN_BIT
+
+
+# Staff limit bookkeeping
+
+# Memberships that count towards BusinessProfile.max_staff
+_COUNTED_STAFF_ROLES = (UserRole.STAFF, UserRole.TENANT_ADMIN)
+
+
+def _counts_towards_staff_limit(role: Optional[str], is_active: Optional[bool]) -> bool:
+    """Whether a membership with this role and status is included in active_staff_count"""
+    return bool(is_active) and role in _COUNTED_STAFF_ROLES
+
+
+def _get_max_staff(db: Session, redis_client: Redis, tenant_id: UUID) -> int:
+    """The tenant's staff limit, read through the Redis cache"""
+    cache_key = tenant_cache_key(redis_client, STAFF_LIMIT_CACHE, tenant_id)
+    if cache_key:
+        cached = cache_get(redis_client, cache_key)
+        if cached is not None:
+            return int(cached)
+    
+    max_staff = db.execute(
+        select(BusinessProfile.max_staff).where(BusinessProfile.tenant_id == tenant_id)
+    ).scalar()
+    if max_staff is None:
+        max_staff = 5
+    
+    if cache_key:
+        cache_set(redis_client, cache_key, str(max_staff).encode(), STAFF_LIMIT_CACHE_TTL)
+    return max_staff
+
+
+def _counted_staff_subquery(tenant_id: UUID):
+    """Live COUNT of the memberships included in active_staff_count"""
+    return select(func.count()).where(
+        TenantUser.tenant_id == tenant_id,
+        TenantUser.role.in_(_COUNTED_STAFF_ROLES),
+        TenantUser.is_active == True
+    ).scalar_subquery()
+
+
+def _seed_active_staff_count(db: Session, tenant_id: UUID) -> None:
+    """Backfill an unseeded (NULL) stored staff count from the memberships, in the caller's transaction"""
+    db.execute(
+        update(BusinessProfile)
+        .where(
+            BusinessProfile.tenant_id == tenant_id,
+            BusinessProfile.active_staff_count.is_(None)
+        )
+        .values(
+            active_staff_count=_counted_staff_subquery(tenant_id),
+            updated_at=BusinessProfile.updated_at
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _adjust_active_staff_count(db: Session, tenant_id: UUID, delta: int) -> None:
+    """
+    Shift the tenant's stored staff count in place, in the caller's transaction.
+    
+    An unseeded count stays NULL (NULL + delta), so it never drifts from the memberships.
+    """
+    if not delta:
+        return
+    
+    db.execute(
+        update(BusinessProfile)
+        .where(BusinessProfile.tenant_id == tenant_id)
+        .values(
+            active_staff_count=BusinessProfile.active_staff_count + delta,
+            # A staffing change is not a profile edit
+            updated_at=BusinessProfile.updated_at
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
 # Staff CRUD Operations
 
-@router.get("/", response_model=Dict[str, Any])
+@router.get("/", response_model=StaffListSchema)
 async def list_staff(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
@@ -99,11 +303,22 @@ async def list_staff(
     is_accepting_bookings: Optional[bool] = Query(None, description="Filter by booking acceptance"),
     search: Optional[str] = Query(None, description="Search by name or email"),
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    after: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page; replaces offset")
 ):
     """Get list of staff members for the tenant"""
     
-    query = db.query(TenantUser).join(User).filter(
+    # The User join serves the search filter and ordering, and also populates staff.user
+    query = db.query(TenantUser).join(User).options(
+        # Only the columns StaffMemberSchema renders; password hashes and NIN/BVN stay behind
+        contains_eager(TenantUser.user).load_only(
+            User.email, User.first_name, User.last_name, User.phone, User.last_login
+        ),
+        defer(TenantUser.permissions),
+        defer(TenantUser.notification_preferences),
+        # Any relationship not loaded above raises instead of lazy-loading per row
+        raiseload("*")
+    ).filter(
         TenantUser.tenant_id == tenant.id,
         TenantUser.role.in_([UserRole.STAFF, UserRole.TENANT_ADMIN, UserRole.TENANT_OWNER])
     )
@@ -128,51 +343,50 @@ async def list_staff(
             )
         )
     
-    # Get total count for pagination
-    total_count = query.count()
-    
-    # Apply pagination and ordering
-    staff_members = query.order_by(
-        desc(TenantUser.role == UserRole.TENANT_OWNER),
-        desc(TenantUser.role == UserRole.TENANT_ADMIN),
-        asc(User.first_name),
-        asc(User.last_name)
-    ).offset(offset).limit(limit).all()
-    
-    # Format response
-    staff_list = []
-    for staff in staff_members:
-        user = staff.user
-        staff_data = {
-            "id": str(staff.id),
-            "user_id": str(user.id),
-            "email": user.email,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "full_name": user.full_name,
-            "phone": user.phone,
-            "role": staff.role,
-            "staff_title": staff.staff_title,
-            "specializations": staff.specializations,
-            "bio": staff.bio,
-            "profile_image_url": staff.profile_image_url,
-            "working_hours": staff.working_hours,
-            "is_accepting_bookings": staff.is_accepting_bookings,
-            "is_active": staff.is_active,
-            "joined_at": staff.joined_at.isoformat(),
-            "last_login": user.last_login.isoformat() if user.last_login else None
-        }
-        staff_list.append(staff_data)
-    
+    order_by = (_ROLE_RANK, asc(User.first_name), asc(User.last_name), asc(TenantUser.id))
+    
+    if after:
+        # Keyset pagination: seek past the previous page's last sort key instead of
+        # scanning and discarding offset rows. The total is not recomputed per page.
+        last_rank, last_first_name, last_last_name, last_id = _decode_cursor(after)
+        rows = query.filter(
+            tuple_(_ROLE_RANK, User.first_name, User.last_name, TenantUser.id)
+            > tuple_(last_rank, last_first_name, last_last_name, last_id)
+        ).order_by(*order_by).limit(limit + 1).all()
+        staff_members = rows
+        total_count = None
+        offset = 0
+    else:
+        # Apply pagination and ordering; the window count is computed before LIMIT,
+        # so every row carries the total and no separate COUNT query is needed
+        rows = query.add_columns(func.count().over().label("total_count")).order_by(
+            *order_by
+        ).offset(offset).limit(limit + 1).all()
+        
+        staff_members = [row[0] for row in rows]
+        if rows:
+            total_count = rows[0].total_count
+        else:
+            # A page past the end has no row to carry the total
+            total_count = query.count() if offset else 0
+    
+    # One extra row was fetched to tell whether another page follows
+    next_cursor = None
+    if len(staff_members) > limit:
+        staff_members = staff_members[:limit]
+        next_cursor = _encode_cursor(staff_members[-1])
+    
+    # StaffListSchema reads the ORM objects directly
     return {
-        "staff": staff_list,
+        "staff": staff_members,
         "total_count": total_count,
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_cursor": next_cursor
     }
 
 
-@router.get("/{staff_id}", response_model=Dict[str, Any])
+@router.get("/{staff_id}", response_model=StaffDetailSchema)
 async def get_staff_member(
     staff_id: UUID,
     tenant_user: TenantUser = Depends(require_tenant_admin),
@@ -181,7 +395,7 @@ async def get_staff_member(
 ):
     """Get a specific staff member by ID"""
     
-    staff = db.query(TenantUser).join(User).filter(
+    staff = db.query(TenantUser).join(User).options(contains_eager(TenantUser.user)).filter(
         and_(
             TenantUser.id == staff_id,
             TenantUser.tenant_id == tenant.id
@@ -194,52 +408,38 @@ async def get_staff_member(
             detail="Staff member not found"
         )
     
-    user = staff.user
-    
     # Get staff performance metrics
     from core.scheduling import Appointment, AppointmentStatus
     from datetime import timedelta
     
     # Last 30 days performance
     thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    recent_appointments = db.query(Appointment).filter(
+    completed = Appointment.status == AppointmentStatus.COMPLETED
+    metrics = db.query(
+        func.count().label("total"),
+        func.count().filter(completed).label("completed"),
+        func.coalesce(func.sum(Appointment.payment_amount).filter(completed), 0).label("revenue"),
+        func.coalesce(func.sum(Appointment.customer_rating).filter(completed), 0).label("rating_sum")
+    ).filter(
         and_(
             Appointment.assigned_staff_id == staff.id,
             Appointment.start_time >= thirty_days_ago
         )
-    ).all()
-    
-    completed_appointments = [a for a in recent_appointments if a.status == AppointmentStatus.COMPLETED]
-    total_revenue = sum([float(a.payment_amount or 0) for a in completed_appointments])
-    average_rating = sum([a.customer_rating for a in completed_appointments if a.customer_rating]) / len(completed_appointments) if completed_appointments else None
-    
-    return {
-        "id": str(staff.id),
-        "user_id": str(user.id),
-        "email": user.email,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "full_name": user.full_name,
-        "phone": user.phone,
-        "role": staff.role,
-        "staff_title": staff.staff_title,
-        "specializations": staff.specializations,
-        "bio": staff.bio,
-        "profile_image_url": staff.profile_image_url,
-        "working_hours": staff.working_hours,
-        "is_accepting_bookings": staff.is_accepting_bookings,
-        "is_active": staff.is_active,
-        "notification_preferences": staff.notification_preferences,
-        "joined_at": staff.joined_at.isoformat(),
-        "last_login": user.last_login.isoformat() if user.last_login else None,
-        "performance_metrics": {
-            "total_appointments_30_days": len(recent_appointments),
-            "completed_appointments_30_days": len(completed_appointments),
-            "total_revenue_30_days": total_revenue,
-            "average_rating": float(average_rating) if average_rating else None,
-            "completion_rate": (len(completed_appointments) / len(recent_appointments) * 100) if recent_appointments else 0
-        }
+    ).one()
+    
+    total_revenue = float(metrics.revenue)
+    average_rating = metrics.rating_sum / metrics.completed if metrics.completed else None
+    
+    staff_detail = StaffDetailSchema.from_orm(staff)
+    staff_detail.performance_metrics = {
+        "total_appointments_30_days": metrics.total,
+        "completed_appointments_30_days": metrics.completed,
+        "total_revenue_30_days": total_revenue,
+        "average_rating": float(average_rating) if average_rating else None,
+        "completion_rate": (metrics.completed / metrics.total * 100) if metrics.total else 0
     }
+    
+    return staff_detail
 
 
 @router.post("/", response_model=Dict[str, Any])
@@ -247,42 +447,39 @@ async def create_staff_member(
     staff_data: StaffCreateSchema,
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Create a new staff member (send invitation)"""
     
-    # Check if user already exists
-    existing_user = db.query(User).filter(User.email == staff_data.email).first()
-    
-    if existing_user:
-        # Check if already part of this tenant
-        existing_tenant_user = db.query(TenantUser).filter(
-            and_(
-                TenantUser.user_id == existing_user.id,
+    # Existing user, existing membership and current staff count in one round trip;
+    # the membership COUNT only runs while the stored counter is unseeded
+    existing_user_id = select(User.id).where(User.email == staff_data.email).scalar_subquery()
+    stored_staff_count = (
+        select(BusinessProfile.active_staff_count)
+        .where(BusinessProfile.tenant_id == tenant.id)
+        .scalar_subquery()
+    )
+    existing_user_id, is_member, stored_count, current_staff_count = db.execute(
+        select(
+            existing_user_id,
+            exists().where(
+                TenantUser.user_id == existing_user_id,
                 TenantUser.tenant_id == tenant.id
-            )
-        ).first()
-        
-        if existing_tenant_user:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="User is already a member of this tenant"
-            )
-    
-    # Check tenant staff limits
-    business_profile = db.query(BusinessProfile).filter(
-        BusinessProfile.tenant_id == tenant.id
-    ).first()
+            ),
+            stored_staff_count,
+            func.coalesce(stored_staff_count, _counted_staff_subquery(tenant.id))
+        )
+    ).one()
     
-    current_staff_count = db.query(TenantUser).filter(
-        and_(
-            TenantUser.tenant_id == tenant.id,
-            TenantUser.role.in_([UserRole.STAFF, UserRole.TENANT_ADMIN]),
-            TenantUser.is_active == True
+    if is_member:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User is already a member of this tenant"
         )
-    ).count()
     
-    max_staff = business_profile.max_staff if business_profile else 5
+    # Check tenant staff limits
+    max_staff = _get_max_staff(db, redis_client, tenant.id)
     
     if current_staff_count >= max_staff:
         raise HTTPException(
@@ -290,6 +487,9 @@ async def create_staff_member(
             detail=f"Staff limit reached ({max_staff}). Please upgrade your subscription."
         )
     
+    if stored_count is None:
+        _seed_active_staff_count(db, tenant.id)
+    
     # Create invitation
     tenant_service = TenantService(db)
     
@@ -303,28 +503,33 @@ async def create_staff_member(
     )
     
     # If user exists, add them directly to tenant
-    if existing_user:
-        tenant_user_new = await tenant_service.add_user_to_tenant(
-            tenant_id=tenant.id,
-            user_id=existing_user.id,
-            role=staff_data.role,
-            added_by_user_id=tenant_user.user_id,
-            staff_title=staff_data.staff_title,
-            specializations=staff_data.specializations
-        )
-        
-        # Update additional staff information
-        tenant_user_new.bio = staff_data.bio
-        tenant_user_new.working_hours = staff_data.working_hours
-        tenant_user_new.is_accepting_bookings = staff_data.is_accepting_bookings
-        tenant_user_new.notification_preferences = staff_data.notification_preferences
+    if existing_user_id:
+        # Issued before the membership insert so add_user_to_tenant's commit
+        # applies both together; memberships are always created active
+        if _counts_towards_staff_limit(staff_data.role, True):
+            _adjust_active_staff_count(db, tenant.id, 1)
         
-        db.commit()
+        try:
+            tenant_user_new = await tenant_service.add_user_to_tenant(
+                tenant_id=tenant.id,
+                user_id=existing_user_id,
+                role=staff_data.role,
+                added_by_user_id=tenant_user.user_id,
+                staff_title=staff_data.staff_title,
+                specializations=staff_data.specializations,
+                bio=staff_data.bio,
+                working_hours=staff_data.working_hours,
+                is_accepting_bookings=staff_data.is_accepting_bookings,
+                notification_preferences=staff_data.notification_preferences
+            )
+        except Exception:
+            db.rollback()
+            raise
         
         logger.info(f"Added existing user {staff_data.email} as staff to tenant {tenant.business_name}")
         
         return {
-            "id": str(tenant_user_new.id),
+            "id": tenant_user_new.id,
             "email": staff_data.email,
             "message": "Staff member added successfully",
             "invitation_required": False
@@ -338,7 +543,7 @@ async def create_staff_member(
     logger.info(f"Created invitation for {staff_data.email} to join tenant {tenant.business_name}")
     
     return {
-        "invitation_id": str(invitation.id),
+        "invitation_id": invitation.id,
         "email": staff_data.email,
         "message": "Staff invitation created successfully",
         "invitation_required": True,
@@ -383,6 +588,7 @@ async def update_staff_member(
         )
     
     user = staff.user
+    was_counted = _counts_towards_staff_limit(staff.role, staff.is_active)
     
     # Update user information
     if staff_data.first_name is not None:
@@ -410,13 +616,16 @@ async def update_staff_member(
     if staff_data.is_active is not None:
         staff.is_active = staff_data.is_active
     
+    is_counted = _counts_towards_staff_limit(staff.role, staff.is_active)
+    _adjust_active_staff_count(db, tenant.id, int(is_counted) - int(was_counted))
+    
     db.commit()
     db.refresh(staff)
     
     logger.info(f"Updated staff member {user.email} for tenant {tenant.business_name}")
     
     return {
-        "id": str(staff.id),
+        "id": staff.id,
         "email": user.email,
         "message": "Staff member updated successfully"
     }
@@ -431,58 +640,92 @@ async def remove_staff_member(
 ):
     """Remove a staff member from the tenant"""
     
-    staff = db.query(TenantUser).join(User).filter(
-        and_(
-            TenantUser.id == staff_id,
-            TenantUser.tenant_id == tenant.id
-        )
-    ).first()
-    
-    if not staff:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Staff member not found"
-        )
-    
-    # Check permissions
-    if staff.role == UserRole.TENANT_OWNER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Cannot remove tenant owner"
-        )
+    from core.scheduling import Appointment, AppointmentStatus
+    active_statuses = [
+        AppointmentStatus.PENDING,
+        AppointmentStatus.CONFIRMED,
+        AppointmentStatus.CHECKED_IN
+    ]
+    has_active_bookings = exists().where(
+        Appointment.assigned_staff_id == TenantUser.id,
+        Appointment.status.in_(active_statuses)
+    )
     
-    if staff.role == UserRole.TENANT_ADMIN and tenant_user.role != UserRole.TENANT_OWNER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only tenant owner can remove admins"
-        )
+    # Owners can never be removed; admins only by the owner
+    protected_mask = _protected_role_mask(tenant_user.role)
+    protected_roles = [role for role, bit in _ROLE_BITS.items() if bit & protected_mask]
     
-    # Check for active bookings
-    from core.scheduling import Appointment, AppointmentStatus
-    active_bookings = db.query(Appointment).filter(
-        and_(
-            Appointment.assigned_staff_id == staff.id,
-            Appointment.status.in_([
-                AppointmentStatus.PENDING,
-                AppointmentStatus.CONFIRMED,
-                AppointmentStatus.CHECKED_IN
-            ])
+    # Soft delete by deactivating, with every check folded into one UPDATE
+    removed = db.execute(
+        update(TenantUser)
+        .where(
+            TenantUser.id == staff_id,
+            TenantUser.tenant_id == tenant.id,
+            TenantUser.is_active == True,
+            TenantUser.role.notin_(protected_roles),
+            ~has_active_bookings
         )
-    ).count()
-    
-    if active_bookings > 0:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Cannot remove staff member with {active_bookings} active bookings. Please reassign or complete them first."
+        .values(is_active=False, is_accepting_bookings=False)
+        .returning(
+            TenantUser.role,
+            select(User.email).where(User.id == TenantUser.user_id).scalar_subquery()
         )
+        .execution_options(synchronize_session=False)
+    ).first()
     
-    # Soft delete by deactivating
-    staff.is_active = False
-    staff.is_accepting_bookings = False
+    if removed:
+        role, email = removed
+        if _counts_towards_staff_limit(role, True):
+            _adjust_active_staff_count(db, tenant.id, -1)
+    else:
+        # Nothing was deactivated; load the member to report which check failed
+        staff = db.query(TenantUser).join(User).filter(
+            and_(
+                TenantUser.id == staff_id,
+                TenantUser.tenant_id == tenant.id
+            )
+        ).first()
+        
+        if not staff:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Staff member not found"
+            )
+        
+        # Check permissions
+        if staff.role == UserRole.TENANT_OWNER:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Cannot remove tenant owner"
+            )
+        
+        if staff.role == UserRole.TENANT_ADMIN and tenant_user.role != UserRole.TENANT_OWNER:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only tenant owner can remove admins"
+            )
+        
+        # Check for active bookings
+        active_bookings = db.query(Appointment).filter(
+            and_(
+                Appointment.assigned_staff_id == staff.id,
+                Appointment.status.in_(active_statuses)
+            )
+        ).count()
+        
+        if active_bookings > 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Cannot remove staff member with {active_bookings} active bookings. Please reassign or complete them first."
+            )
+        
+        # Already inactive
+        staff.is_accepting_bookings = False
+        email = staff.user.email
     
     db.commit()
     
-    logger.info(f"Removed staff member {staff.user.email} from tenant {tenant.business_name}")
+    logger.info(f"Removed staff member {email} from tenant {tenant.business_name}")
     
     return {"message": "Staff member removed successfully"}
 
@@ -500,7 +743,10 @@ async def get_staff_schedule(
 ):
     """Get staff member's schedule"""
     
-    staff = db.query(TenantUser).filter(
+    staff = db.query(TenantUser).options(
+        joinedload(TenantUser.user),
+        raiseload("*")
+    ).filter(
         and_(
             TenantUser.id == staff_id,
             TenantUser.tenant_id == tenant.id
@@ -516,7 +762,7 @@ async def get_staff_schedule(
     # Get staff schedules
     from core.scheduling import StaffSchedule
     
-    query = db.query(StaffSchedule).filter(
+    query = db.query(StaffSchedule).options(raiseload("*")).filter(
         and_(
             StaffSchedule.staff_id == staff.id,
             StaffSchedule.tenant_id == tenant.id
@@ -531,18 +777,18 @@ async def get_staff_schedule(
     schedules = query.order_by(StaffSchedule.date).all()
     
     return {
-        "staff_id": str(staff_id),
+        "staff_id": staff_id,
         "staff_name": staff.user.full_name,
         "working_hours": staff.working_hours,
         "schedules": [
             {
-                "id": str(schedule.id),
-                "date": schedule.date.isoformat(),
+                "id": schedule.id,
+                "date": schedule.date,
                 "is_working": schedule.is_working,
-                "start_time": schedule.start_time.isoformat() if schedule.start_time else None,
-                "end_time": schedule.end_time.isoformat() if schedule.end_time else None,
-                "break_start": schedule.break_start.isoformat() if schedule.break_start else None,
-                "break_end": schedule.break_end.isoformat() if schedule.break_end else None,
+                "start_time": schedule.start_time,
+                "end_time": schedule.end_time,
+                "break_start": schedule.break_start,
+                "break_end": schedule.break_end,
                 "max_appointments": schedule.max_appointments,
                 "schedule_type": schedule.schedule_type,
                 "notes": schedule.notes
@@ -576,27 +822,23 @@ async def update_staff_schedule(
         )
     
     # Update working hours in TenantUser
-    working_hours = {}
-    days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-    
-    for schedule in schedules:
-        day_name = days[schedule.day_of_week]
-        if schedule.is_working and schedule.start_time and schedule.end_time:
-            working_hours[day_name] = {
-                "start": schedule.start_time,
-                "end": schedule.end_time,
-                "break_start": schedule.break_start,
-                "break_end": schedule.break_end
-            }
-    
-    staff.working_hours = working_hours
+    staff.working_hours = {
+        _WORKING_HOURS_DAYS[schedule.day_of_week]: {
+            "start": schedule.start_time,
+            "end": schedule.end_time,
+            "break_start": schedule.break_start,
+            "break_end": schedule.break_end
+        }
+        for schedule in schedules
+        if schedule.is_working and schedule.start_time and schedule.end_time
+    }
     
     db.commit()
     
     logger.info(f"Updated schedule for staff member {staff.user.email}")
     
     return {
-        "staff_id": str(staff_id),
+        "staff_id": staff_id,
         "message": "Staff schedule updated successfully"
     }
 
@@ -626,51 +868,86 @@ async def get_staff_performance(
             detail="Staff member not found"
         )
     
-    # Get appointments for analysis
-    from core.scheduling import Appointment, AppointmentStatus
+    from core.scheduling import Appointment, AppointmentStatus, StaffDailyMetrics
     from datetime import timedelta
     
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
+    window_start = datetime.combine(start_date.date(), time.min)
+    
+    # Days that have been rolled up come from the per-staff daily rollup
+    rolled_up = db.query(
+        func.coalesce(func.sum(StaffDailyMetrics.total_appointments), 0).label("total"),
+        func.coalesce(func.sum(StaffDailyMetrics.completed_appointments), 0).label("completed"),
+        func.coalesce(func.sum(StaffDailyMetrics.cancelled_appointments), 0).label("cancelled"),
+        func.coalesce(func.sum(StaffDailyMetrics.no_show_appointments), 0).label("no_show"),
+        func.coalesce(func.sum(StaffDailyMetrics.total_revenue), 0).label("revenue"),
+        func.coalesce(func.sum(StaffDailyMetrics.rating_sum), 0).label("rating_sum"),
+        func.coalesce(func.sum(StaffDailyMetrics.rating_count), 0).label("rating_count")
+    ).filter(
+        and_(
+            StaffDailyMetrics.staff_id == staff.id,
+            StaffDailyMetrics.date >= start_date.date(),
+            StaffDailyMetrics.date <= end_date.date()
+        )
+    ).one()
     
-    appointments = db.query(Appointment).filter(
+    # Any day without a rollup row (today, days not rolled up yet, or days invalidated
+    # by a late appointment change) is aggregated live from the appointments
+    has_rollup = db.query(StaffDailyMetrics).filter(
+        and_(
+            StaffDailyMetrics.staff_id == Appointment.assigned_staff_id,
+            StaffDailyMetrics.date == func.date(Appointment.start_time)
+        )
+    ).exists()
+    completed = Appointment.status == AppointmentStatus.COMPLETED
+    rated = and_(completed, Appointment.customer_rating > 0)
+    live = db.query(
+        func.count().label("total"),
+        func.count().filter(completed).label("completed"),
+        func.count().filter(Appointment.status == AppointmentStatus.CANCELLED).label("cancelled"),
+        func.count().filter(Appointment.status == AppointmentStatus.NO_SHOW).label("no_show"),
+        func.coalesce(func.sum(Appointment.payment_amount).filter(completed), 0).label("revenue"),
+        func.coalesce(func.sum(Appointment.customer_rating).filter(rated), 0).label("rating_sum"),
+        func.count().filter(rated).label("rating_count")
+    ).filter(
         and_(
             Appointment.assigned_staff_id == staff.id,
-            Appointment.start_time >= start_date,
-            Appointment.start_time <= end_date
+            Appointment.start_time >= window_start,
+            Appointment.start_time <= end_date,
+            ~has_rollup
         )
-    ).all()
+    ).one()
     
     # Calculate metrics
-    total_appointments = len(appointments)
-    completed_appointments = [a for a in appointments if a.status == AppointmentStatus.COMPLETED]
-    cancelled_appointments = [a for a in appointments if a.status == AppointmentStatus.CANCELLED]
-    no_show_appointments = [a for a in appointments if a.status == AppointmentStatus.NO_SHOW]
-    
-    total_revenue = sum([float(a.payment_amount or 0) for a in completed_appointments])
-    ratings = [a.customer_rating for a in completed_appointments if a.customer_rating]
-    average_rating = sum(ratings) / len(ratings) if ratings else None
+    total_appointments = rolled_up.total + live.total
+    completed_appointments = rolled_up.completed + live.completed
+    cancelled_appointments = rolled_up.cancelled + live.cancelled
+    no_show_appointments = rolled_up.no_show + live.no_show
+    total_revenue = float(rolled_up.revenue + live.revenue)
+    rating_count = rolled_up.rating_count + live.rating_count
+    average_rating = (rolled_up.rating_sum + live.rating_sum) / rating_count if rating_count else None
     
     # Calculate utilization (appointments vs available time)
     # This is a simplified calculation
-    total_hours_worked = len(completed_appointments) * 1  # Assume 1 hour per appointment
+    total_hours_worked = completed_appointments * 1  # Assume 1 hour per appointment
     
     return {
-        "staff_id": str(staff_id),
+        "staff_id": staff_id,
         "staff_name": staff.user.full_name,
         "period": f"{start_date.date()} to {end_date.date()}",
         "metrics": {
             "total_appointments": total_appointments,
-            "completed_appointments": len(completed_appointments),
-            "cancelled_appointments": len(cancelled_appointments),
-            "no_show_appointments": len(no_show_appointments),
-            "completion_rate": (len(completed_appointments) / total_appointments * 100) if total_appointments > 0 else 0,
-            "cancellation_rate": (len(cancelled_appointments) / total_appointments * 100) if total_appointments > 0 else 0,
-            "no_show_rate": (len(no_show_appointments) / total_appointments * 100) if total_appointments > 0 else 0,
+            "completed_appointments": completed_appointments,
+            "cancelled_appointments": cancelled_appointments,
+            "no_show_appointments": no_show_appointments,
+            "completion_rate": (completed_appointments / total_appointments * 100) if total_appointments > 0 else 0,
+            "cancellation_rate": (cancelled_appointments / total_appointments * 100) if total_appointments > 0 else 0,
+            "no_show_rate": (no_show_appointments / total_appointments * 100) if total_appointments > 0 else 0,
             "total_revenue": total_revenue,
-            "average_booking_value": total_revenue / len(completed_appointments) if completed_appointments else 0,
+            "average_booking_value": total_revenue / completed_appointments if completed_appointments else 0,
             "average_rating": float(average_rating) if average_rating else None,
-            "total_ratings": len(ratings),
+            "total_ratings": rating_count,
             "estimated_hours_worked": total_hours_worked
         }
     }
@@ -678,7 +955,7 @@ async def get_staff_performance(
 
 # Staff Invitations
 
-@router.get("/invitations", response_model=List[Dict[str, Any]])
+@router.get("/invitations", response_model=List[StaffInvitationSchema])
 async def list_staff_invitations(
     tenant_user: TenantUser = Depends(require_tenant_admin),
     tenant: Tenant = Depends(get_current_tenant),
@@ -687,29 +964,14 @@ async def list_staff_invitations(
 ):
     """Get list of pending staff invitations"""
     
-    query = db.query(TenantInvitation).filter(
+    query = db.query(TenantInvitation).options(raiseload("*")).filter(
         TenantInvitation.tenant_id == tenant.id
     )
     
     if status_filter:
         query = query.filter(TenantInvitation.status == status_filter)
     
-    invitations = query.order_by(desc(TenantInvitation.created_at)).all()
-    
-    return [
-        {
-            "id": str(invitation.id),
-            "email": invitation.email,
-            "phone": invitation.phone,
-            "invited_role": invitation.invited_role,
-            "status": invitation.status,
-            "suggested_name": invitation.suggested_name,
-            "created_at": invitation.created_at.isoformat(),
-            "expires_at": invitation.expires_at.isoformat(),
-            "accepted_at": invitation.accepted_at.isoformat() if invitation.accepted_at else None
-        }
-        for invitation in invitations
-    ]
+    return query.order_by(desc(TenantInvitation.created_at)).all()
 
 
 @router.delete("/invitations/{invitation_id}")
@@ -760,8 +1022,8 @@ async def bulk_update_staff(
 ):
     """Bulk update multiple staff members"""
     
-    # Validate staff IDs belong to tenant
-    staff_members = db.query(TenantUser).filter(
+    # Validate staff IDs belong to tenant, reading only what the permission checks need
+    staff_members = db.query(TenantUser.id, TenantUser.role, TenantUser.is_active).filter(
         and_(
             TenantUser.id.in_(staff_ids),
             TenantUser.tenant_id == tenant.id
@@ -774,20 +1036,34 @@ async def bulk_update_staff(
             detail="One or more staff members not found"
         )
     
-    # Apply updates
     allowed_fields = ['is_active', 'is_accepting_bookings', 'notification_preferences']
+    values = {field: value for field, value in updates.items() if field in allowed_fields}
     
-    for staff in staff_members:
-        # Check permissions for each staff member
-        if staff.role == UserRole.TENANT_OWNER:
-            continue  # Skip owner
-        
-        if staff.role == UserRole.TENANT_ADMIN and tenant_user.role != UserRole.TENANT_OWNER:
-            continue  # Skip admin if not owner
+    # Check permissions for each staff member, skipping roles the caller may not manage
+    protected_mask = _protected_role_mask(tenant_user.role)
+    eligible_staff = [
+        staff for staff in staff_members
+        if not _ROLE_BITS.get(staff.role, 0) & protected_mask
+    ]
+    
+    # Apply updates to every eligible member in one statement
+    if values and eligible_staff:
+        if "is_active" in values:
+            _adjust_active_staff_count(db, tenant.id, sum(
+                int(_counts_towards_staff_limit(staff.role, values["is_active"]))
+                - int(_counts_towards_staff_limit(staff.role, staff.is_active))
+                for staff in eligible_staff
+            ))
         
-        for field, value in updates.items():
-            if field in allowed_fields:
-                setattr(staff, field, value)
+        db.execute(
+            update(TenantUser)
+            .where(
+                TenantUser.id.in_([staff.id for staff in eligible_staff]),
+                TenantUser.tenant_id == tenant.id
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
     
     db.commit()
     
@@ -3,15 +3,18 @@ Public booking routes for BookingBot NG
 Customer-facing API endpoints for service discovery and appointment booking
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime, date, time, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, Query as OrmQuery, contains_eager, raiseload
+from sqlalchemy import and_, or_, desc, asc, func, cast, text, Integer
 from loguru import logger
 from pydantic import BaseModel, Field
+from redis import Redis, RedisError
+import orjson
 
 # Core imports
 from core.auth import get_current_tenant, Tenant
@@ -21,6 +24,7 @@ from core.scheduling import (
 )
 from core.payment_processor import PaystackClient, NIPVerifier
 from core.database import get_db
+from core.cache import get_redis, tenant_cache_key, bump_tenant_cache_version, cache_get, cache_set
 
 # Tenant imports
 from tenants.models import (
@@ -28,8 +32,27 @@ from tenants.models import (
     CustomerProfileSchema, BookingFormDataSchema, BookingSource,
     generate_customer_reference
 )
+from tenants.routes.admin.service_routes import SERVICE_LIST_CACHE
+from tenants.routes.admin.settings_routes import SETTINGS_CACHE
 
-router = APIRouter(prefix="", tags=["Public Booking"])
+router = APIRouter(prefix="", tags=["Public Booking"], default_response_class=ORJSONResponse)
+
+# The public catalog shares the admin service list namespace, so every
+# service write in the admin routes invalidates it as well
+PUBLIC_SERVICES_CACHE_TTL = 120
+SERVICE_CATEGORIES_CACHE_TTL = 3600
+
+# Business info shares the admin settings namespace, so profile edits invalidate it;
+# the status TTL is short because opening hours and bookable services drift with time
+BUSINESS_INFO_CACHE_TTL = 300
+BUSINESS_STATUS_CACHE_TTL = 30
+
+# Availability is invalidated by every booking and cancellation; the short
+# TTL bounds staleness from schedule changes made elsewhere
+AVAILABILITY_CACHE = "availability"
+AVAILABILITY_CACHE_TTL = 60
+
+CUSTOMER_SEQUENCE_KEY = "customer_seq:{tenant_id}"
 
 
 # Pydantic Schemas for Public API
@@ -50,6 +73,14 @@ class ServiceDisplaySchema(BaseModel):
     custom_fields: List[Dict[str, Any]] = []
 
 
+class ServicePageSchema(BaseModel):
+    """One page of bookable services"""
+    items: List[ServiceDisplaySchema]
+    total: int
+    page: int
+    page_size: int
+
+
 class BusinessInfoSchema(BaseModel):
     """Schema for public business information"""
     business_name: str
@@ -88,12 +119,92 @@ class BookingRequestSchema(BaseModel):
     referral_source: Optional[str] = None
 
 
+def _highest_customer_number(db: Session, tenant_id: UUID) -> int:
+    """Highest number already issued to the tenant, read from the trailing digits of its customer references"""
+    issued = cast(func.substring(TenantCustomer.customer_reference, "[0-9]+$"), Integer)
+    return db.query(func.coalesce(func.max(issued), 0)).filter(
+        TenantCustomer.tenant_id == tenant_id
+    ).scalar()
+
+
+def _next_customer_number(db: Session, redis_client: Redis, tenant_id: UUID) -> int:
+    """
+    Allocate the next per-tenant customer number for generate_customer_reference.
+    
+    Uses an atomic Redis counter, seeded from the highest number already issued
+    whenever the key is missing (first use, eviction or flush). The counter only
+    moves forward, so failed bookings leave gaps rather than reusing numbers. If
+    Redis is unavailable, falls back to the highest issued number under a
+    per-tenant advisory lock held until the booking transaction ends.
+    """
+    key = CUSTOMER_SEQUENCE_KEY.format(tenant_id=tenant_id)
+    try:
+        if not redis_client.exists(key):
+            redis_client.set(key, _highest_customer_number(db, tenant_id), nx=True)
+        return redis_client.incr(key)
+    except RedisError as e:
+        logger.warning(f"Customer sequence unavailable for tenant {tenant_id}: {e}")
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": key})
+        return _highest_customer_number(db, tenant_id) + 1
+
+
+def _paginate(query: OrmQuery, order_by: Tuple[Any, ...], page: int, page_size: int) -> Tuple[List[Any], int]:
+    """
+    Fetch one page of a query along with the total number of matching rows.
+    
+    The total comes from a COUNT(*) OVER () window evaluated before LIMIT, so
+    the page and its total share one round trip.
+    """
+    rows = query.add_columns(func.count().over().label("total")).order_by(
+        *order_by
+    ).offset((page - 1) * page_size).limit(page_size).all()
+    
+    if rows:
+        return [row[0] for row in rows], rows[0].total
+    
+    # A page past the end has no row to carry the total
+    return [], query.count() if page > 1 else 0
+
+
+def _public_service_row(service: TenantServiceConfig) -> Dict[str, Any]:
+    """
+    Format a service in the ServiceDisplaySchema shape.
+    
+    The denormalized columns are NULL on rows written before they existed, so
+    each falls back to the stored configuration, which was validated on write
+    and is read as-is instead of re-parsed.
+    """
+    config = service.configuration
+    pricing = config.get("pricing", {})
+    availability = config.get("availability", {})
+    base_price = service.base_price if service.base_price is not None else pricing.get("base_price", 0)
+    
+    return {
+        "id": service.id,
+        "name": service.name,
+        "description": service.description,
+        "category": service.category,
+        "subcategory": service.subcategory,
+        "duration_minutes": (
+            service.duration_minutes if service.duration_minutes is not None
+            else availability.get("duration_minutes", 60)
+        ),
+        "base_price": float(base_price),
+        "currency": service.currency or pricing.get("currency", "NGN"),
+        "image_url": service.image_url if service.image_url is not None else config.get("image_url"),
+        "is_featured": service.is_featured,
+        "booking_instructions": config.get("booking_instructions"),
+        "custom_fields": config.get("custom_fields", [])
+    }
+
+
 # Business Information Endpoints
 
 @router.get("/info", response_model=BusinessInfoSchema)
-async def get_business_info(
+def get_business_info(
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Get public business information"""
     
@@ -103,6 +214,12 @@ async def get_business_info(
             detail="Business not found"
         )
     
+    cache_key = tenant_cache_key(redis_client, SETTINGS_CACHE, tenant.id, "public_info")
+    if cache_key:
+        cached = cache_get(redis_client, cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+    
     # Get business profile
     business_profile = db.query(BusinessProfile).filter(
         BusinessProfile.tenant_id == tenant.id
@@ -110,7 +227,7 @@ async def get_business_info(
     
     if not business_profile:
         # Return basic tenant information
-        return BusinessInfoSchema(
+        business_info = BusinessInfoSchema(
             business_name=tenant.business_name,
             tagline=None,
             description=tenant.description,
@@ -122,25 +239,32 @@ async def get_business_info(
             review_count=0,
             branding={}
         )
+    else:
+        business_info = BusinessInfoSchema(
+            business_name=tenant.business_name,
+            tagline=business_profile.tagline,
+            description=business_profile.description,
+            address=business_profile.address,
+            contact_info=business_profile.contact_info,
+            business_hours=business_profile.business_hours,
+            specialties=business_profile.specialties,
+            customer_rating=float(business_profile.customer_rating) if business_profile.customer_rating else None,
+            review_count=business_profile.review_count,
+            branding=business_profile.branding
+        )
     
-    return BusinessInfoSchema(
-        business_name=tenant.business_name,
-        tagline=business_profile.tagline,
-        description=business_profile.description,
-        address=business_profile.address,
-        contact_info=business_profile.contact_info,
-        business_hours=business_profile.business_hours,
-        specialties=business_profile.specialties,
-        customer_rating=float(business_profile.customer_rating) if business_profile.customer_rating else None,
-        review_count=business_profile.review_count,
-        branding=business_profile.branding
-    )
+    response = ORJSONResponse(business_info.dict())
+    if cache_key:
+        cache_set(redis_client, cache_key, response.body, BUSINESS_INFO_CACHE_TTL)
+    
+    return response
 
 
 @router.get("/status")
-async def get_business_status(
+def get_business_status(
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Check if business is currently open and accepting bookings"""
     
@@ -150,39 +274,62 @@ async def get_business_status(
             detail="Business not found"
         )
     
+    # Only the profile-derived fields are cached; status and clock are always current
+    cache_key = tenant_cache_key(redis_client, SETTINGS_CACHE, tenant.id, "public_status")
+    if cache_key:
+        cached = cache_get(redis_client, cache_key)
+        if cached is not None:
+            return {
+                **orjson.loads(cached),
+                "business_status": tenant.status,
+                "current_time": datetime.now().isoformat()
+            }
+    
     business_profile = db.query(BusinessProfile).filter(
         BusinessProfile.tenant_id == tenant.id
     ).first()
     
     is_open = business_profile.is_open_now() if business_profile else False
     
-    # Check if business is accepting online bookings
-    active_services = db.query(TenantServiceConfig).filter(
-        and_(
-            TenantServiceConfig.tenant_id == tenant.id,
-            TenantServiceConfig.is_active == True,
-            TenantServiceConfig.is_online_bookable == True
-        )
-    ).count()
+    # Check if business is accepting online bookings; EXISTS stops at the first match
+    has_bookable_services = db.query(
+        db.query(TenantServiceConfig).filter(
+            and_(
+                TenantServiceConfig.tenant_id == tenant.id,
+                TenantServiceConfig.is_active == True,
+                TenantServiceConfig.is_online_bookable == True
+            )
+        ).exists()
+    ).scalar()
     
-    return {
+    profile_status = {
         "is_open": is_open,
-        "accepts_online_bookings": active_services > 0,
+        "accepts_online_bookings": has_bookable_services,
+        "timezone": business_profile.get_business_hours().timezone if business_profile else "Africa/Lagos"
+    }
+    if cache_key:
+        cache_set(redis_client, cache_key, orjson.dumps(profile_status), BUSINESS_STATUS_CACHE_TTL)
+    
+    return {
+        **profile_status,
         "business_status": tenant.status,
-        "timezone": business_profile.get_business_hours().timezone if business_profile else "Africa/Lagos",
         "current_time": datetime.now().isoformat()
     }
 
 
 # Service Discovery
 
-@router.get("/services", response_model=List[ServiceDisplaySchema])
-async def list_public_services(
+@router.get("/services", response_model=ServicePageSchema)
+def list_public_services(
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
     category: Optional[str] = Query(None, description="Filter by category"),
     featured_only: bool = Query(False, description="Show only featured services"),
-    search: Optional[str] = Query(None, description="Search services")
+    tag: Optional[str] = Query(None, description="Filter by service tag"),
+    search: Optional[str] = Query(None, description="Search services"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=100)
 ):
     """Get list of bookable services"""
     
@@ -192,6 +339,15 @@ async def list_public_services(
             detail="Business not found"
         )
     
+    cache_key = tenant_cache_key(
+        redis_client, SERVICE_LIST_CACHE, tenant.id,
+        "public", category, featured_only, tag, search, page, page_size
+    )
+    if cache_key:
+        cached = cache_get(redis_client, cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+    
     query = db.query(TenantServiceConfig).filter(
         and_(
             TenantServiceConfig.tenant_id == tenant.id,
@@ -207,47 +363,49 @@ async def list_public_services(
     if featured_only:
         query = query.filter(TenantServiceConfig.is_featured == True)
     
+    if tag:
+        # Served by the GIN index on configuration -> 'tags'
+        query = query.filter(TenantServiceConfig.configuration["tags"].contains([tag]))
+    
     if search:
+        # Served by the pg_trgm GIN indexes on name and description
+        pattern = f"%{search}%"
         query = query.filter(
             or_(
-                TenantServiceConfig.name.ilike(f"%{search}%"),
-                TenantServiceConfig.description.ilike(f"%{search}%")
+                TenantServiceConfig.name.ilike(pattern),
+                TenantServiceConfig.description.ilike(pattern)
             )
         )
     
-    # Order by featured first, then display order
-    services = query.order_by(
-        desc(TenantServiceConfig.is_featured),
-        asc(TenantServiceConfig.display_order),
-        asc(TenantServiceConfig.name)
-    ).all()
+    # Order by featured first, then display order; id keeps pages stable
+    services, total = _paginate(
+        query,
+        (
+            desc(TenantServiceConfig.is_featured),
+            asc(TenantServiceConfig.display_order),
+            asc(TenantServiceConfig.name),
+            asc(TenantServiceConfig.id)
+        ),
+        page, page_size
+    )
     
-    # Format for public display
-    service_list = []
-    for service in services:
-        config = service.to_schema()
-        
-        service_display = ServiceDisplaySchema(
-            id=str(service.id),
-            name=service.name,
-            description=service.description,
-            category=service.category,
-            subcategory=service.subcategory,
-            duration_minutes=config.availability.duration_minutes,
-            base_price=float(config.pricing.base_price),
-            currency=config.pricing.currency,
-            image_url=config.image_url,
-            is_featured=service.is_featured,
-            booking_instructions=config.booking_instructions,
-            custom_fields=[field.dict() for field in config.custom_fields]
-        )
-        service_list.append(service_display)
+    # Format for public display as plain dicts
+    service_list = [_public_service_row(service) for service in services]
+    
+    response = ORJSONResponse({
+        "items": service_list,
+        "total": total,
+        "page": page,
+        "page_size": page_size
+    })
+    if cache_key:
+        cache_set(redis_client, cache_key, response.body, PUBLIC_SERVICES_CACHE_TTL)
     
-    return service_list
+    return response
 
 
 @router.get("/services/{service_id}", response_model=ServiceDisplaySchema)
-async def get_service_details(
+def get_service_details(
     service_id: UUID,
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db)
@@ -296,10 +454,11 @@ async def get_service_details(
 # Availability and Slot Management
 
 @router.get("/services/{service_id}/availability", response_model=List[AvailableSlotSchema])
-async def get_service_availability(
+def get_service_availability(
     service_id: UUID,
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis),
     date_from: date = Query(..., description="Start date for availability check"),
     date_to: Optional[date] = Query(None, description="End date (defaults to 7 days from start)"),
     staff_id: Optional[UUID] = Query(None, description="Specific staff member")
@@ -312,6 +471,17 @@ async def get_service_availability(
             detail="Business not found"
         )
     
+    # Default to 7 days if end date not provided
+    if not date_to:
+        date_to = date_from + timedelta(days=7)
+    
+    # Limit to maximum 30 days, rejected before touching the database
+    if (date_to - date_from).days > 30:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Maximum 30 days range allowed"
+        )
+    
     service = db.query(TenantServiceConfig).filter(
         and_(
             TenantServiceConfig.id == service_id,
@@ -327,16 +497,14 @@ async def get_service_availability(
             detail="Service not found"
         )
     
-    # Default to 7 days if end date not provided
-    if not date_to:
-        date_to = date_from + timedelta(days=7)
-    
-    # Limit to maximum 30 days
-    if (date_to - date_from).days > 30:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Maximum 30 days range allowed"
-        )
+    cache_key = tenant_cache_key(
+        redis_client, AVAILABILITY_CACHE, tenant.id,
+        service_id, staff_id, date_from, date_to
+    )
+    if cache_key:
+        cached = cache_get(redis_client, cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
     
     # Get available slots using core scheduling service
     scheduling_service = SchedulingService(db)
@@ -350,30 +518,37 @@ async def get_service_availability(
             staff_id=str(staff_id) if staff_id else None
         )
         
-        # Format slots for response
-        formatted_slots = []
-        for slot in available_slots:
-            # Get staff information if available
-            staff_name = None
-            if slot.get('staff_id'):
-                from core.auth import TenantUser, User
-                staff_user = db.query(TenantUser).join(User).filter(
-                    TenantUser.id == slot['staff_id']
-                ).first()
-                if staff_user:
-                    staff_name = staff_user.user.full_name
-            
-            formatted_slot = AvailableSlotSchema(
-                start_time=slot['start_time'],
-                end_time=slot['end_time'],
-                duration_minutes=slot['duration_minutes'],
-                staff_id=slot.get('staff_id'),
-                staff_name=staff_name,
-                price=float(service.to_schema().pricing.base_price)
-            )
-            formatted_slots.append(formatted_slot)
+        # Resolve every staff name in one query rather than one per slot; with a
+        # staff filter every slot belongs to that one member
+        if staff_id:
+            staff_ids = {str(staff_id)} if available_slots else set()
+        else:
+            staff_ids = {str(slot['staff_id']) for slot in available_slots if slot.get('staff_id')}
+        staff_names = {}
+        if staff_ids:
+            from core.auth import TenantUser, User
+            staff_members = db.query(TenantUser).join(TenantUser.user).options(
+                contains_eager(TenantUser.user).load_only(User.first_name, User.last_name),
+                raiseload("*")
+            ).filter(TenantUser.id.in_(staff_ids)).all()
+            staff_names = {str(staff.id): staff.user.full_name for staff in staff_members}
+        
+        # Every slot carries the service's base price, so parse the configuration once
+        price = float(service.to_schema().pricing.base_price)
         
-        return formatted_slots
+        # Format slots for response as plain dicts in the AvailableSlotSchema shape,
+        # so wide windows do not hold a model instance and a dict copy per slot
+        formatted_slots = [
+            {
+                "start_time": slot['start_time'],
+                "end_time": slot['end_time'],
+                "duration_minutes": slot['duration_minutes'],
+                "staff_id": slot.get('staff_id'),
+                "staff_name": staff_names.get(str(slot['staff_id'])) if slot.get('staff_id') else None,
+                "price": price
+            }
+            for slot in available_slots
+        ]
         
     except Exception as e:
         logger.error(f"Error getting availability for service {service_id}: {str(e)}")
@@ -381,16 +556,23 @@ async def get_service_availability(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error retrieving availability"
         )
+    
+    response = ORJSONResponse(formatted_slots)
+    if cache_key:
+        cache_set(redis_client, cache_key, response.body, AVAILABILITY_CACHE_TTL)
+    
+    return response
 
 
 # Booking Creation
 
 @router.post("/book", response_model=Dict[str, Any])
-async def create_booking(
+def create_booking(
     booking_request: BookingRequestSchema,
     request: Request,
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Create a new booking"""
     
@@ -428,7 +610,7 @@ async def create_booking(
         # Create new customer
         customer_reference = generate_customer_reference(
             str(tenant.id),
-            db.query(TenantCustomer).filter(TenantCustomer.tenant_id == tenant.id).count() + 1
+            _next_customer_number(db, redis_client, tenant.id)
         )
         
         customer = TenantCustomer(
@@ -438,12 +620,15 @@ async def create_booking(
             acquisition_source=booking_request.booking_source.value
         )
         db.add(customer)
-        db.flush()  # Get customer ID
     else:
         # Update existing customer profile
         customer.profile_data = booking_request.customer_profile.dict()
         customer.last_visit_date = datetime.utcnow()
     
+    # Commit the customer on its own so its row lock is not held through the
+    # slot search and appointment creation below
+    db.commit()
+    
     # Create booking using core scheduling service
     scheduling_service = SchedulingService(db)
     
@@ -532,6 +717,7 @@ async def create_booking(
         customer.last_booking_date = datetime.utcnow()
         
         db.commit()
+        bump_tenant_cache_version(redis_client, AVAILABILITY_CACHE, tenant.id)
         
         # Get local time for response
         local_start_time = convert_to_local_time(appointment.start_time, "Africa/Lagos")
@@ -582,7 +768,7 @@ async def create_booking(
 # Booking Management
 
 @router.get("/bookings/{booking_reference}", response_model=Dict[str, Any])
-async def get_booking_details(
+def get_booking_details(
     booking_reference: str,
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db)
@@ -595,35 +781,40 @@ async def get_booking_details(
             detail="Business not found"
         )
     
-    # Get appointment by booking reference
+    # Get appointment by booking reference, with its service, tenant booking
+    # and customer outer-joined in so the page costs a single round trip
     from core.scheduling import Appointment
-    appointment = db.query(Appointment).filter(
+    row = db.query(
+        Appointment,
+        TenantServiceConfig.id.label("service_id"),
+        TenantServiceConfig.name.label("service_name"),
+        TenantServiceConfig.description.label("service_description"),
+        TenantServiceConfig.category.label("service_category"),
+        TenantBooking.id.label("tenant_booking_id"),
+        TenantBooking.custom_field_responses,
+        TenantCustomer.customer_reference
+    ).outerjoin(
+        TenantServiceConfig, TenantServiceConfig.id == Appointment.service_id
+    ).outerjoin(
+        TenantBooking, TenantBooking.appointment_id == Appointment.id
+    ).outerjoin(
+        TenantCustomer, TenantCustomer.id == TenantBooking.customer_id
+    ).options(
+        raiseload("*")
+    ).filter(
         and_(
             Appointment.booking_reference == booking_reference,
             Appointment.tenant_id == tenant.id
         )
     ).first()
     
-    if not appointment:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Booking not found"
         )
     
-    # Get service information
-    service = db.query(TenantServiceConfig).filter(
-        TenantServiceConfig.id == appointment.service_id
-    ).first()
-    
-    # Get tenant booking for additional information
-    tenant_booking = db.query(TenantBooking).filter(
-        TenantBooking.appointment_id == appointment.id
-    ).first()
-    
-    # Get customer information
-    customer = db.query(TenantCustomer).filter(
-        TenantCustomer.id == tenant_booking.customer_id
-    ).first() if tenant_booking else None
+    appointment = row.Appointment
     
     # Convert times to local timezone
     local_start_time = convert_to_local_time(appointment.start_time, "Africa/Lagos")
@@ -633,15 +824,15 @@ async def get_booking_details(
         "booking_reference": appointment.booking_reference,
         "status": appointment.status,
         "service": {
-            "name": service.name,
-            "description": service.description,
-            "category": service.category
-        } if service else None,
+            "name": row.service_name,
+            "description": row.service_description,
+            "category": row.service_category
+        } if row.service_id else None,
         "customer": {
             "name": appointment.customer_name,
             "email": appointment.customer_email,
             "phone": appointment.customer_phone,
-            "reference": customer.customer_reference if customer else None
+            "reference": row.customer_reference
         },
         "appointment_time": {
             "start": local_start_time.isoformat(),
@@ -657,7 +848,7 @@ async def get_booking_details(
             "currency": "NGN"
         },
         "special_requests": appointment.special_requests,
-        "custom_field_responses": tenant_booking.custom_field_responses if tenant_booking else {},
+        "custom_field_responses": row.custom_field_responses if row.tenant_booking_id else {},
         "created_at": appointment.created_at.isoformat(),
         "can_cancel": appointment.status in ["pending", "confirmed"],
         "can_reschedule": appointment.status in ["pending", "confirmed"]
@@ -665,11 +856,12 @@ async def get_booking_details(
 
 
 @router.post("/bookings/{booking_reference}/cancel", response_model=Dict[str, Any])
-async def cancel_booking(
+def cancel_booking(
     booking_reference: str,
     cancellation_reason: Optional[str] = Body(None),
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Cancel a booking"""
     
@@ -679,9 +871,9 @@ async def cancel_booking(
             detail="Business not found"
         )
     
-    # Get appointment
+    # Get appointment; only its own columns are read here
     from core.scheduling import Appointment, AppointmentStatus
-    appointment = db.query(Appointment).filter(
+    appointment = db.query(Appointment).options(raiseload("*")).filter(
         and_(
             Appointment.booking_reference == booking_reference,
             Appointment.tenant_id == tenant.id
@@ -717,6 +909,7 @@ async def cancel_booking(
             appointment_id=str(appointment.id),
             cancellation_reason=cancellation_reason
         )
+        bump_tenant_cache_version(redis_client, AVAILABILITY_CACHE, tenant.id)
         
         logger.info(f"Cancelled booking {booking_reference}")
         
@@ -738,9 +931,10 @@ async def cancel_booking(
 # Utility Endpoints
 
 @router.get("/categories", response_model=List[Dict[str, Any]])
-async def get_service_categories(
+def get_service_categories(
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    redis_client: Redis = Depends(get_redis)
 ):
     """Get available service categories for this business"""
     
@@ -750,8 +944,15 @@ async def get_service_categories(
             detail="Business not found"
         )
     
-    # Get categories that have active services
-    from sqlalchemy import func
+    # Categories only change with service writes, which bump this namespace
+    cache_key = tenant_cache_key(redis_client, SERVICE_LIST_CACHE, tenant.id, "public_categories")
+    if cache_key:
+        cached = cache_get(redis_client, cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+    
+    # Get categories that have active services; served by the partial
+    # (tenant_id, category) index for bookable services
     categories = db.query(
         TenantServiceConfig.category,
         func.count(TenantServiceConfig.id).label('service_count')
@@ -763,13 +964,17 @@ async def get_service_categories(
         )
     ).group_by(TenantServiceConfig.category).all()
     
-    return [
+    response = ORJSONResponse([
         {
             "category": category,
             "service_count": service_count
         }
         for category, service_count in categories
-    ]
+    ])
+    if cache_key:
+        cache_set(redis_client, cache_key, response.body, SERVICE_CATEGORIES_CACHE_TTL)
+    
+    return response
 
 
 @router.get("/holidays", response_model=List[Dict[str, str]])
@@ -797,11 +1002,13 @@ async def get_business_holidays(
     ]
 
 
-@router.get("/staff", response_model=List[Dict[str, Any]])
-async def get_public_staff_list(
+@router.get("/staff", response_model=Dict[str, Any])
+def get_public_staff_list(
     tenant: Tenant = Depends(get_current_tenant),
     db: Session = Depends(get_db),
-    service_id: Optional[UUID] = Query(None, description="Filter staff by service")
+    service_id: Optional[UUID] = Query(None, description="Filter staff by service"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=100)
 ):
     """Get list of staff available for booking"""
     
@@ -813,7 +1020,11 @@ async def get_public_staff_list(
     
     from core.auth import TenantUser, User, UserRole
     
-    query = db.query(TenantUser).join(User).filter(
+    # The User join serves the ordering and also populates staff.user with just the name columns
+    query = db.query(TenantUser).join(TenantUser.user).options(
+        contains_eager(TenantUser.user).load_only(User.first_name, User.last_name),
+        raiseload("*")
+    ).filter(
         and_(
             TenantUser.tenant_id == tenant.id,
             TenantUser.role.in_([UserRole.STAFF, UserRole.TENANT_ADMIN, UserRole.TENANT_OWNER]),
@@ -822,16 +1033,25 @@ async def get_public_staff_list(
         )
     )
     
-    staff_members = query.all()
+    staff_members, total = _paginate(
+        query,
+        (asc(User.first_name), asc(User.last_name), asc(TenantUser.id)),
+        page, page_size
+    )
     
-    return [
-        {
-            "id": str(staff.id),
-            "name": staff.user.full_name,
-            "title": staff.staff_title,
-            "bio": staff.bio,
-            "specializations": staff.specializations,
-            "profile_image_url": staff.profile_image_url
-        }
-        for staff in staff_members
-    ]
\ No newline at end of file
+    return {
+        "items": [
+            {
+                "id": str(staff.id),
+                "name": staff.user.full_name,
+                "title": staff.staff_title,
+                "bio": staff.bio,
+                "specializations": staff.specializations,
+                "profile_image_url": staff.profile_image_url
+            }
+            for staff in staff_members
+        ],
+        "total": total,
+        "page": page,
+        "page_size": page_size
+    }
\ No newline at end of file